@@ -0,0 +1,68 @@
+'''
+Seconds to write every page of a site, one page at a time and across
+worker processes. Also checks that both give the same files.
+
+    python -m benchmarks.benchmark_build site.smg [workers]
+'''
+
+import filecmp
+import os
+import sys
+import tempfile
+import time
+
+from smeagol.editor.interface import assets, builder
+from smeagol.editor.interface.output import Output
+from smeagol.editor.interface.templates.template_store import TemplateStore
+from smeagol.site.site import Site
+from smeagol.utilities import filesystem as fs
+from smeagol.widgets.styles.styles import Styles
+
+
+def serial(config, site_data, directory):
+    links = {name: fs.load_yaml(link)
+             for name, link in config.get('links', {}).items()}
+    styles = Styles(fs.load_yaml(config.get('styles', '')), links=links)
+    store = TemplateStore(assets.Templates(config.get('templates', {})),
+                          styles)
+    site = Site(**site_data)
+    names = list(reversed(list(site.iternames())))
+    return builder.serially(store, Output(directory), site, names)
+
+
+def parallel(config, site_data, directory, workers):
+    build = builder.Build(config, site_data, directory, {})
+    names = list(reversed(list(Site(**site_data).iternames())))
+    return builder.in_parallel(build, Output(directory), names, workers)
+
+
+def measure(name, done):
+    start = time.perf_counter()
+    for _ in done:
+        pass
+    seconds = time.perf_counter() - start
+    print(f'{name:>24}: {seconds:8.3f} s')
+
+
+def same(left, right):
+    files = [os.path.relpath(filename, left)
+             for filename in fs.walk(left, lambda _name: True)]
+    _match, mismatch, errors = filecmp.cmpfiles(left, right, files, False)
+    return len(files), not (mismatch or errors)
+
+
+def main(filename, workers=0):
+    config = fs.open_config(filename)
+    source = assets.Assets(config.get('assets', {})).source
+    with tempfile.TemporaryDirectory() as one, \
+            tempfile.TemporaryDirectory() as many:
+        measure('serial', serial(config, fs.load_yaml(source), one))
+        workers = workers or os.cpu_count()
+        measure(f'{workers} workers',
+                parallel(config, fs.load_yaml(source), many, workers))
+        count, identical = same(one, many)
+        print(f'{"same files":>24}: {identical} ({count} pages)')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1], *map(int, sys.argv[2:]))
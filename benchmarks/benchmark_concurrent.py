@@ -0,0 +1,44 @@
+'''
+Renders every page of a site many times over from threads that share
+one TemplateStore, switching between threads as often as Python allows,
+and checks that each page comes out as it does when rendered alone.
+
+    python -m benchmarks.benchmark_concurrent site.smg [threads] [rounds]
+'''
+
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.benchmark_render import load
+from smeagol.editor.interface.templates.template_store import TemplateStore
+from smeagol.utilities import filesystem as fs
+from smeagol.widgets.styles.styles import Styles
+
+
+def store(templates, styles, links):
+    return TemplateStore(templates, Styles(fs.load_yaml(styles), links=links))
+
+
+def main(filename, threads=8, rounds=5):
+    site, *args = load(filename)
+    pages = [site.new(list(names)) for names in site.iternames()]
+    start = time.perf_counter()
+    serial = [store(*args).html(page) for page in pages]
+    print(f'{"each alone":>24}: {time.perf_counter() - start:8.3f} s')
+    shared = store(*args)
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(threads) as pool:
+            concurrent = list(pool.map(shared.html, pages * rounds))
+        seconds = time.perf_counter() - start
+    finally:
+        sys.setswitchinterval(interval)
+    print(f'{f"{threads} threads x {rounds}":>24}: {seconds:8.3f} s')
+    print(f'{"same html":>24}: {concurrent == serial * rounds}')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1], *map(int, sys.argv[2:]))
@@ -0,0 +1,63 @@
+'''
+Microseconds to resolve a path through a node with many children, such
+as a dictionary's lex: the old scan along the siblings for each name
+against the name -> index map the Directory keeps. Also checks that
+both find the same locations.
+
+    python -m benchmarks.benchmark_fan_out [lookups per fan-out]
+'''
+
+import random
+import sys
+import time
+
+from smeagol.site import family
+from smeagol.site.directory import Directory
+
+FAN_OUTS = 100, 1000, 10000, 50000
+
+
+class LegacyDirectory(Directory):
+    def location(self, names):
+        location = []
+        obj = self.directory
+        for name in names[1:]:
+            index = scan(obj, name)
+            location.append(index)
+            obj = obj[index]
+        return location
+
+
+def scan(obj, name):
+    for index, elt in enumerate(obj[1:], start=1):
+        if family.get_name(elt) == name:
+            return index
+    raise ValueError(f'{family.get_name(obj)} has no item {name}')
+
+
+def directory(fan_out):
+    return ['Site', ['lex', *([f'word{n}'] for n in range(fan_out))]]
+
+
+def measure(name, obj, paths):
+    start = time.perf_counter()
+    locations = [obj.location(path) for path in paths]
+    seconds = time.perf_counter() - start
+    print(f'{name:>24}: {1e6 * seconds / len(paths):8.1f} us')
+    return locations
+
+
+def main(lookups=1000):
+    rng = random.Random(0)
+    for fan_out in FAN_OUTS:
+        tree = directory(fan_out)
+        paths = [['Site', 'lex', f'word{rng.randrange(fan_out)}']
+                 for _ in range(lookups)]
+        print(f'fan-out {fan_out}, {lookups} lookups')
+        old = measure('scan siblings', LegacyDirectory(tree), paths)
+        new = measure('name -> index', Directory(tree), paths)
+        print(f'{"same locations":>24}: {old == new}')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,93 @@
+'''
+Seconds to write every page of a site and note what each one read,
+then to find the pages out of date with nothing changed, and to write
+only those out of date after editing one entry and adding another.
+Also checks that the pages then match a full build of the edited site.
+
+    python -m benchmarks.benchmark_incremental site.smg
+'''
+
+import filecmp
+import os
+import sys
+import tempfile
+import time
+
+from smeagol.editor.interface import assets, build_graph, builder
+from smeagol.editor.interface.output import Output
+from smeagol.editor.interface.templates.template_store import TemplateStore
+from smeagol.site.site import Site
+from smeagol.utilities import filesystem as fs
+from smeagol.widgets.styles.styles import Styles
+
+
+def store(config):
+    links = {name: fs.load_yaml(link)
+             for name, link in config.get('links', {}).items()}
+    styles = Styles(fs.load_yaml(config.get('styles', '')), links=links)
+    return TemplateStore(assets.Templates(config.get('templates', {})),
+                         styles)
+
+
+def build(config, site, directory, graph, names=None):
+    '''Write names, or every page, and note what each one read'''
+    if names is None:
+        names = list(reversed(list(site.iternames())))
+    reads = {}
+    for _done in builder.serially(store(config), Output(directory), site,
+                                  names, reads):
+        pass
+    graph.record(site, reads)
+    graph.save(build_graph.assets(config))
+    return names
+
+
+def edit(site):
+    '''Add a line to one entry, and a child to another'''
+    pages = list(site.hierarchy)
+    page = pages[len(pages) // 2]
+    page.text = page.data.get('text', []) + ['An edited line']
+    child = site.new(pages[len(pages) // 4].names + ['An added entry'])
+    site.add_entry(child)
+    child.text = ['A new line']
+
+
+def measure(name, function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    seconds = time.perf_counter() - start
+    print(f'{name:>24}: {seconds:8.3f} s ({len(result)} pages)')
+    return result
+
+
+def same(left, right):
+    files = [os.path.relpath(filename, left)
+             for filename in fs.walk(left, lambda _name: True)]
+    _match, mismatch, errors = filecmp.cmpfiles(left, right, files, False)
+    return len(files), not (mismatch or errors)
+
+
+def main(filename):
+    config = fs.open_config(filename)
+    source = assets.Assets(config.get('assets', {})).source
+    with tempfile.TemporaryDirectory() as folder:
+        graph = build_graph.BuildGraph(os.path.join(folder, 'site'))
+        changed, full = (os.path.join(folder, name)
+                         for name in ('changed', 'full'))
+        site = Site(**fs.load_yaml(source))
+        measure('full build', build, config, site, changed, graph)
+        names = list(reversed(list(site.iternames())))
+        assets_digest = build_graph.assets(config)
+        measure('nothing changed', graph.changed, site, names, assets_digest)
+        edit(site)
+        names = list(reversed(list(site.iternames())))
+        out_of_date = graph.changed(site, names, assets_digest)
+        measure('out of date only', build,
+                config, site, changed, graph, out_of_date)
+        build(config, site, full, build_graph.BuildGraph(''))
+        count, identical = same(full, changed)
+        print(f'{"same files":>24}: {identical} ({count} pages)')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1])
@@ -0,0 +1,87 @@
+'''
+Seconds to write every page of a site into a directory that already
+holds them: rewriting every file, against writing only the files whose
+html has changed, first reading the files back and then trusting the
+manifest. Then removes an entry, and checks that a whole build deletes
+its page and touches no file but those it writes.
+
+    python -m benchmarks.benchmark_output site.smg
+'''
+
+import os
+import sys
+import tempfile
+import time
+
+from smeagol.editor.interface import assets, builder
+from smeagol.editor.interface.output import Output
+from smeagol.editor.interface.templates.template_store import TemplateStore
+from smeagol.site.site import Site
+from smeagol.utilities import filesystem as fs
+from smeagol.widgets.styles.styles import Styles
+
+
+class Rewrite(Output):
+    '''Every page written, as before there was a manifest'''
+
+    def save(self, html, filename):
+        fs.save_string(html, filename)
+        self.written += 1
+        return True
+
+
+def store(config):
+    links = {name: fs.load_yaml(link)
+             for name, link in config.get('links', {}).items()}
+    styles = Styles(fs.load_yaml(config.get('styles', '')), links=links)
+    return TemplateStore(assets.Templates(config.get('templates', {})),
+                         styles)
+
+
+def measure(name, site, templates, output, clean=False):
+    names = list(reversed(list(site.iternames())))
+    start = time.perf_counter()
+    for _done in builder.serially(templates, output, site, names):
+        pass
+    counts = output.finish(clean)
+    seconds = time.perf_counter() - start
+    summary = ', '.join(f'{count} {kind}' for kind, count in counts.items())
+    print(f'{name:>24}: {seconds:8.3f} s ({summary})')
+    return counts
+
+
+def mtimes(directory):
+    return {filename: os.stat(filename).st_mtime_ns
+            for filename in fs.walk(directory, lambda _name: True)}
+
+
+def main(filename):
+    config = fs.open_config(filename)
+    source = assets.Assets(config.get('assets', {})).source
+    site, templates = Site(**fs.load_yaml(source)), store(config)
+    with tempfile.TemporaryDirectory() as folder:
+        directory, manifest = (os.path.join(folder, name)
+                               for name in ('site', 'source'))
+        measure('first build', site, templates, Rewrite(directory))
+        measure('rewrite every file', site, templates, Rewrite(directory))
+        measure('changed, read back', site, templates,
+                Output(directory, manifest))
+        measure('changed, by manifest', site, templates,
+                Output(directory, manifest))
+        page = list(site.hierarchy)[-1]
+        filename = os.path.join(directory, page.url)
+        page.data.entries.pop('text', None)
+        site.remove_entry(page)
+        before = mtimes(directory)
+        counts = measure('entry removed', site, templates,
+                         Output(directory, manifest), clean=True)
+        after = mtimes(directory)
+        touched = [name for name, mtime in after.items()
+                   if before[name] != mtime]
+        print(f'{"page deleted":>24}: {filename not in after}')
+        print(f'{"only written touched":>24}: '
+              f'{len(touched) == counts["written"]}')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1])
@@ -0,0 +1,59 @@
+'''
+Seconds to parse lines where many tags close at the same boundary: the
+old list-based Tags.rationalise against the rank-ordered one. Also
+checks that both give the same tree.
+
+    python -m benchmarks.benchmark_rationalise [tags per line] [lines]
+'''
+
+import random
+import sys
+import time
+
+from smeagol.conversion.text_tree.text_tree import TextTree
+from tests.reference import LegacyTree, flatten
+
+RANKS = {f't{n}': n % 7 - 3 for n in range(0, 10000, 2)}
+
+
+def nested(count):
+    names = [f't{n}' for n in range(count)]
+    return line(names, reversed(names))
+
+
+def overlapping(count):
+    names = [f't{n}' for n in range(count)]
+    return line(names, random.sample(names, count))
+
+
+def repeated(count):
+    names = [random.choice(['t0', 't1', 't2']) for _ in range(count)]
+    return line(names, random.sample(names, count))
+
+
+def line(opening, closing):
+    opening = ''.join(f'<{name}>' for name in opening)
+    closing = ''.join(f'</{name}>' for name in closing)
+    return f'{opening}word{closing}'
+
+
+def measure(name, tree, lines):
+    start = time.perf_counter()
+    result = tree(lines, RANKS)
+    seconds = time.perf_counter() - start
+    print(f'{name:>24}: {seconds:8.3f} s')
+    return flatten(result.root)
+
+
+def main(count=500, lines=20):
+    random.seed(0)
+    for case in (nested, overlapping, repeated):
+        text = [case(count) for _ in range(lines)]
+        print(f'{case.__name__}, {lines} lines of {count} tags')
+        legacy = measure('sort and scan', LegacyTree, text)
+        new = measure('rank-ordered', TextTree, text)
+        print(f'{"same tree":>24}: {legacy == new}')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
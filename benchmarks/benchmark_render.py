@@ -0,0 +1,52 @@
+'''
+Seconds to render every page of a site through its templates, with
+tags interpreted afresh on each node and with compiled tags. Also checks
+that both give the same html.
+
+    python -m benchmarks.benchmark_render site.smg
+'''
+
+import sys
+import time
+
+from smeagol.editor.interface import assets
+from smeagol.editor.interface.templates.template_store import TemplateStore
+from smeagol.site.site import Site
+from smeagol.utilities import filesystem as fs
+from smeagol.widgets.styles.styles import Styles
+
+
+def load(filename):
+    config = fs.open_config(filename)
+    source = assets.Assets(config.get('assets', {})).source
+    links = {name: fs.load_yaml(link)
+             for name, link in config.get('links', {}).items()}
+    return (Site(**fs.load_yaml(source)),
+            assets.Templates(config.get('templates', {})),
+            config.get('styles', ''), links)
+
+
+def render(site, templates, styles, links, compiled):
+    styles = Styles(fs.load_yaml(styles), links=links)
+    store = TemplateStore(templates, styles, compiled=compiled)
+    return [store.html(site.new(list(names))) for names in site.iternames()]
+
+
+def measure(name, *args):
+    start = time.perf_counter()
+    pages = render(*args)
+    seconds = time.perf_counter() - start
+    print(f'{name:>24}: {seconds:8.3f} s')
+    return pages
+
+
+def main(filename):
+    site, *args = load(filename)
+    print(f'{len(site)} pages')
+    interpreted = measure('interpreted', site, *args, False)
+    compiled = measure('compiled', site, *args, True)
+    print(f'{"same html":>24}: {interpreted == compiled}')
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
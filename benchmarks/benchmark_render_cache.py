@@ -0,0 +1,82 @@
+'''
+Seconds to write every page of a site with the render cache empty, and
+then again as a fresh session would, with the site, templates, build
+graph and cache all loaded anew. Also checks that both give the same
+files, and that a cache with a small limit keeps to it.
+
+    python -m benchmarks.benchmark_render_cache site.smg
+'''
+
+import filecmp
+import os
+import sys
+import tempfile
+import time
+
+from smeagol.editor.interface import assets, build_graph, builder
+from smeagol.editor.interface.output import Output
+from smeagol.editor.interface.render_cache import RenderCache
+from smeagol.editor.interface.templates.template_store import TemplateStore
+from smeagol.site.site import Site
+from smeagol.utilities import filesystem as fs
+from smeagol.widgets.styles.styles import Styles
+
+
+def session(config, source, folder, directory, limit=1 << 28):
+    '''Load everything afresh, then write every page through the cache'''
+    links = {name: fs.load_yaml(link)
+             for name, link in config.get('links', {}).items()}
+    styles = Styles(fs.load_yaml(config.get('styles', '')), links=links)
+    store = TemplateStore(assets.Templates(config.get('templates', {})),
+                          styles)
+    site = Site(**fs.load_yaml(source))
+    graph = build_graph.BuildGraph(os.path.join(folder, 'site'))
+    assets_digest = build_graph.assets(config)
+    cache = RenderCache(os.path.join(folder, 'renders'), limit).start(
+        site, graph, assets_digest)
+    names = list(reversed(list(site.iternames())))
+    reads = {}
+    for _done in builder.serially(store, Output(directory), site, names,
+                                  reads, cache):
+        pass
+    graph.record(site, reads, cache.digests)
+    graph.save(assets_digest)
+    return cache
+
+
+def measure(name, *args):
+    start = time.perf_counter()
+    cache = session(*args)
+    seconds = time.perf_counter() - start
+    print(f'{name:>24}: {seconds:8.3f} s ({cache})')
+    return cache
+
+
+def same(left, right):
+    files = [os.path.relpath(filename, left)
+             for filename in fs.walk(left, lambda _name: True)]
+    _match, mismatch, errors = filecmp.cmpfiles(left, right, files, False)
+    return len(files), not (mismatch or errors)
+
+
+def main(filename):
+    config = fs.open_config(filename)
+    source = assets.Assets(config.get('assets', {})).source
+    with tempfile.TemporaryDirectory() as folder:
+        cold, warm = (os.path.join(folder, name) for name in ('cold', 'warm'))
+        measure('empty cache', config, source, folder, cold)
+        cache = measure('fresh session', config, source, folder, warm)
+        count, identical = same(cold, warm)
+        print(f'{"same files":>24}: {identical} ({count} pages)')
+        limit = cache.size // 4
+        with tempfile.TemporaryDirectory() as small:
+            cache = measure(f'limit of {limit} bytes', config, source, small,
+                            os.path.join(small, 'site'), limit)
+            on_disk = sum(os.path.getsize(name) for name in fs.walk(
+                os.path.join(small, 'renders'), lambda _name: True))
+            print(f'{"kept to limit":>24}: {on_disk <= limit} '
+                  f'({on_disk} bytes, {len(cache.sizes)} pages)')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1])
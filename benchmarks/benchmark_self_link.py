@@ -0,0 +1,78 @@
+'''
+Seconds to render pages full of anchors: the old regex over each
+finished page, which turned links to the page itself into spans,
+against spotting those links as each anchor is rendered. Also checks
+that both give the same html, and shows what the regex made of pages
+whose names hold regex metacharacters.
+
+    python -m benchmarks.benchmark_self_link [pages] [anchors per page]
+'''
+
+import random
+import re
+import sys
+import time
+
+from smeagol.conversion.text_tree import tree_cache
+from smeagol.editor.interface.templates.template import Context, Template
+from smeagol.editor.interface.templates.template_store import TemplateStore
+from smeagol.site.site import Site
+from smeagol.widgets.styles.styles import Styles
+from tests.reference import LegacyTemplate
+
+STYLES = {'a': {'type': 'anchor'}, 'b': {}, 'line': {'type': 'line'},
+          'ref': {'type': 'anchor', 'param': '$text$.html">$node$'}}
+
+
+def site(names):
+    return Site(directory=['Site', *([name] for name in names)],
+                entries={'children': {'Site': {'children': {
+                    name: {} for name in names}}}})
+
+
+def text(names, count, rng):
+    lines = []
+    for _ in range(count):
+        name = rng.choice(names)
+        lines.append(f'<line>Go to <a>{name}.html#top|<b>{name}</b></a> '
+                     f'or <ref>{name}</ref></line>')
+    return lines
+
+
+def measure(name, template, pages, trees):
+    output = []
+    start = time.perf_counter()
+    for page, tree in zip(pages, trees):
+        template.text = tree
+        output.append(template.html(Context(page, written=page)))
+    seconds = time.perf_counter() - start
+    print(f'{name:>24}: {seconds:8.3f} s')
+    return output
+
+
+def main(count=500, anchors=200):
+    rng = random.Random(0)
+    names = [f'entry{n}' for n in range(count)]
+    pages = list(site(names).hierarchy)[1:]
+    trees = [tree_cache.parse(text(names, anchors, rng)) for _ in pages]
+    store = TemplateStore(styles=Styles(dict(STYLES)))
+    legacy = LegacyTemplate(None, None, None, store)
+    new = Template(None, None, None, store)
+    print(f'{count} pages of {anchors} anchors')
+    old = measure('regex per page', legacy, pages, trees)
+    fresh = measure('per anchor', new, pages, trees)
+    print(f'{"same html":>24}: {old == fresh}')
+    for name, other in (('e.g', 'eag'), ('c++', 'c++')):
+        page = site([name, other]).new(['Site', name])
+        legacy.text = new.text = tree_cache.parse(
+            [f'<line><a>{other}.html|{other}</a></line>'])
+        try:
+            old = legacy.html(Context(page, written=page)).strip()
+        except re.error as e:
+            old = f're.error: {e}'
+        print(f'{f"link to {other} on {name}":>24}: {old}')
+        print(f'{"":>24}  {new.html(Context(page, written=page)).strip()}')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
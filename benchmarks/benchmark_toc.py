@@ -0,0 +1,111 @@
+'''
+Milliseconds per page to render a table of contents on sites of 1k, 10k
+and 50k entries: the old scan of the whole hierarchy for every page
+against the walk over the page's family alone. Also checks that both
+give the same html.
+
+    python -m benchmarks.benchmark_toc [pages sampled per site]
+'''
+
+import sys
+import time
+
+from smeagol.conversion.text_tree import tree_cache
+from smeagol.editor.interface.templates.template import Context, Template
+from smeagol.editor.interface.templates.template_store import TemplateStore
+from smeagol.site.site import Site
+from smeagol.utilities import utils
+from smeagol.widgets.styles.styles import Styles
+
+SIZES = 1000, 10000, 50000
+GROUPS = 'lineage-siblings-children', 'matriarchs-aunts', 'heirs'
+STYLES = {'toc': {'type': 'toc', 'param': '<a href="$link$">$name$</a>',
+                  'open': '<ul>', 'close': '</ul>',
+                  'start': '<li>', 'end': '</li>'}}
+
+
+class LegacyTemplate(Template):
+    def toc(self, obj, _components, tag, context):
+        self._level = -1
+        open_tags = []
+        output = ''
+        page = context.page
+        try:
+            family = page.reunion(obj.first_child.split('-'))
+        except ValueError:
+            family = page.root.reunion(obj.first_child.split('-'))
+        except IndexError:
+            return ''
+        for entry in page.hierarchy:
+            if entry in family:
+                for _ in range(max(0, self._level - entry.level)):
+                    with utils.ignored(IndexError):
+                        output += open_tags.pop()
+                num = max(0, entry.level -
+                          self._level) if self._level > -1 else 1
+                for _ in range(num):
+                    if open_tags:
+                        output += tag.start + tag.open
+                        open_tags += [tag.close + tag.end]
+                    else:
+                        output += tag.open
+                        open_tags = [tag.close]
+                self._level = entry.level
+                output += tag.start or ''
+                if entry == page:
+                    output += entry.name
+                else:
+                    output += tag.param.replace('$link$', utils.link(entry)
+                                                ).replace('$name$', entry.name)
+                output += tag.end or ''
+        output += ''.join(reversed(open_tags))
+        return output
+
+
+def site(size):
+    '''A root with ten sections, each a shallow tree of about size/10'''
+    directory, entries = ['Site'], {}
+    per = size // 10
+    for section in range(10):
+        name = f's{section}'
+        children, branch = {}, [name]
+        for child in range(0, per, 10):
+            leaves = [f'{name}.{child}.{leaf}' for leaf in range(9)]
+            children[f'{name}.{child}'] = {
+                'children': {leaf: {} for leaf in leaves}}
+            branch.append([f'{name}.{child}', *([leaf] for leaf in leaves)])
+        entries[name] = {'children': children}
+        directory.append(branch)
+    return Site(directory=directory,
+                entries={'children': {'Site': {'children': entries}}})
+
+
+def measure(name, template, pages, groups):
+    text = template.text = tree_cache.parse([f'<toc>{groups}</toc>'])
+    output = []
+    start = time.perf_counter()
+    for page in pages:
+        context = Context(page, written=page)
+        output.append(''.join(template._html(elt, None, context)
+                              for elt in text))
+    seconds = time.perf_counter() - start
+    print(f'{name:>24}: {1000 * seconds / len(pages):8.3f} ms')
+    return output
+
+
+def main(sample=20):
+    store = TemplateStore(styles=Styles(dict(STYLES)))
+    legacy = LegacyTemplate(None, None, None, store)
+    new = Template(None, None, None, store)
+    for size in SIZES:
+        pages = list(site(size).hierarchy)
+        pages = pages[::max(1, len(pages) // sample)]
+        for groups in GROUPS:
+            print(f'{size} entries, {len(pages)} pages, {groups}')
+            old = measure('whole hierarchy', legacy, pages, groups)
+            fresh = measure('family only', new, pages, groups)
+            print(f'{"same html":>24}: {old == fresh}')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,95 @@
+'''
+Tokens per second for TextTree parsing, over synthetic, heavily tagged
+entries: the old per-line `re.split` and `_retag` dispatch against the
+single-pass tokenizer.
+
+    python -m benchmarks.benchmark_tokenizer [entries] [lines per entry]
+'''
+
+import random
+import re
+import sys
+import time
+
+from smeagol.conversion.text_tree.text_tree import TextTree
+from smeagol.conversion.text_tree.tokenizer import tokenize
+from smeagol.utilities import utils
+
+TAGS = ['b', 'i', 'link', 'ipa', 'highlulani@hl', 'span', 'small-caps']
+RANKS = {'b': 3, 'i': 2, 'link': 5, 'span': 1}
+
+
+def entry(lines):
+    return [line() for _ in range(lines)]
+
+
+def line():
+    words = []
+    for _ in range(random.randint(4, 16)):
+        tags = random.sample(TAGS, random.randint(0, 3))
+        opening = ''.join(f'<{tag}>' for tag in tags)
+        closing = ''.join(f'</{tag}>' for tag in reversed(tags))
+        words.append(f'{opening}word{closing}')
+    return ' '.join(words)
+
+
+def split_tokens(lines):
+    tokens = []
+    for text in lines:
+        utils.alternate([lambda x: tokens.append(('text', x)),
+                         lambda x: tokens.append(('tag', x))],
+                        re.split('[<>]', text + '\n'))
+    return tokens
+
+
+def legacy_parse(lines):
+    tree = TextTree([], RANKS)
+    for text in lines:
+        utils.alternate([lambda x: retag(tree, 'text', x), _tag(tree)],
+                        re.split('[<>]', text + '\n'))
+    if tree.state == 'tagoff':
+        tree.rationalise()
+    return tree
+
+
+def _tag(tree):
+    def retag_tag(tag):
+        status = 'off' if tag.startswith('/') else 'on'
+        retag(tree, f'tag{status}', tag.removeprefix('/'))
+    return retag_tag
+
+
+def retag(tree, key, value):
+    if not value:
+        return
+    tree.update_state(key)
+    match key:
+        case 'tagon':
+            tree.tagon(value)
+        case 'text':
+            tree.text(value)
+        case 'tagoff':
+            tree.tagoff(value)
+
+
+def measure(name, fn, entries, tokens):
+    start = time.perf_counter()
+    for lines in entries:
+        fn(lines)
+    seconds = time.perf_counter() - start
+    print(f'{name:>24}: {tokens / seconds:12,.0f} tokens/s ({seconds:.3f} s)')
+
+
+def main(count=2000, lines=20):
+    random.seed(0)
+    entries = [entry(lines) for _ in range(count)]
+    tokens = sum(len(list(tokenize(lines))) for lines in entries)
+    print(f'{count} entries, {tokens:,} tokens')
+    measure('re.split tokens', split_tokens, entries, tokens)
+    measure('tokenize', lambda x: list(tokenize(x)), entries, tokens)
+    measure('re.split and _retag', legacy_parse, entries, tokens)
+    measure('TextTree', lambda x: TextTree(x, RANKS), entries, tokens)
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
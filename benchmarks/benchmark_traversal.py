@@ -0,0 +1,55 @@
+'''
+Milliseconds to walk every entry of a synthetic site: building a Page
+for each, as iterating over the site does, against the names and data
+that Site.iteritems gives without wrapping either. Also times len(site)
+counted afresh and once kept, and checks that every walk sees the same
+entries.
+
+    python -m benchmarks.benchmark_traversal [sections] [entries per section]
+'''
+
+import sys
+import time
+
+from smeagol.site.site import Site
+
+
+def site(sections, size):
+    '''A root with sections, each holding size entries in groups of ten'''
+    directory, entries = ['Site'], {}
+    for section in range(sections):
+        name = f's{section}'
+        branch, children = [name], {}
+        for group in range(0, size, 10):
+            leaves = [f'{name}.{group}.{leaf}' for leaf in range(9)]
+            branch.append([f'{name}.{group}', *([leaf] for leaf in leaves)])
+            children[f'{name}.{group}'] = {
+                'text': ['group'],
+                'children': {leaf: {'text': ['leaf']} for leaf in leaves}}
+        directory.append(branch)
+        entries[name] = {'children': children}
+    return Site(directory=directory,
+                entries={'children': {'Site': {'children': entries}}})
+
+
+def measure(name, walk):
+    start = time.perf_counter()
+    result = walk()
+    seconds = time.perf_counter() - start
+    print(f'{name:>24}: {1000 * seconds:10.3f} ms')
+    return result
+
+
+def main(sections=52, size=1000):
+    pages = site(sections, size)
+    print(f'{sections * (size + 1) + 1} entries')
+    old = measure('Page per entry', lambda: [
+        (tuple(page.names), page.data.entries) for page in pages])
+    new = measure('iteritems', lambda: list(pages.iteritems()))
+    measure('len, counted', lambda: len(pages))
+    measure('len, kept', lambda: len(pages))
+    print(f'{"same entries":>24}: {old == new}')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
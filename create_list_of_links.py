@@ -14,6 +14,7 @@ class Creator:
         self.site = self.interface.site
         self.newfile = newfile
         self.link_list = self.setup_list()
+        self.headings = self.find_headings()
         for entry in self.site:
             self.serialise(entry)
 
@@ -21,18 +22,20 @@ class Creator:
         return fs.load_yaml(self.newfile,
                             default_obj={})
 
+    def find_headings(self):
+        names = [style.name for style in self.interface.styles
+                 if style.type == 'heading']
+        headings = {}
+        for entry, node in self.site.find_tags(*names):
+            headings.setdefault(tuple(entry), []).append(node)
+        return headings
+
     def serialise(self, entry):
         link = '/'.join(entry.link)
         self.add(entry.name, link)
-        self._serialise(entry.text, link)
-
-    def _serialise(self, obj, link):
-        for node in obj.nodes():
-            if self.interface.styles[node.name].type == 'heading':
-                url = str(node.first_child)
-                self.add(url, link + '#' + url)
-                continue
-            self._serialise(node, link)
+        for node in self.headings.get(tuple(entry.names), []):
+            url = str(node.first_child)
+            self.add(url, link + '#' + url)
 
     def add(self, key, value):
         key, value = map(utils.url_form, [key, value])
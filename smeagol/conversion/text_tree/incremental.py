@@ -0,0 +1,127 @@
+'''
+Re-parse only the lines of an entry that have changed.
+
+A line starts clean when no tag is open and no closer is waiting to be
+rationalised, so parsing from there is the same as parsing from scratch.
+Every clean line is a checkpoint, along with the number of top-level
+nodes before it. An update re-parses from the last checkpoint before the
+first changed line, and stops as soon as it reaches a clean line that
+was also a checkpoint before, past the last changed line. Everything
+after that is unchanged, so the old top-level nodes are reused.
+
+Each update returns a new TextTree, and leaves those it returned before
+as they were. A reused top-level node is copied into the new tree, and
+the copy shares its children with the node in the earlier tree, so their
+parent is still that node.
+'''
+
+from bisect import bisect_right
+
+from smeagol.conversion.text_tree.node import Node
+from smeagol.conversion.text_tree.text_tree import TextTree
+from smeagol.conversion.text_tree.tokenizer import tokenize
+
+
+class IncrementalTree:
+    def __init__(self, ranks=None):
+        self.ranks = ranks
+        self.lines = []
+        self.children = []
+        self.starts = [0]  # clean line numbers
+        self.counts = [0]  # top-level nodes before each clean line
+        self.tree = TextTree([], ranks)
+        self.parsed = None  # the root of the nodes parsed last
+
+    def update(self, lines: list[str]) -> TextTree:
+        lines = list(lines)
+        old = self.lines
+        prefix = _common(old, lines)
+        if prefix == len(old) == len(lines):
+            return self.tree
+        suffix = _common(reversed(old[prefix:]), reversed(lines[prefix:]))
+        start = bisect_right(self.starts, prefix) - 1
+        if not self._parse(lines, start, len(lines) - suffix):
+            self.__init__(self.ranks)
+            self._parse(lines, 0, len(lines))
+        self.lines = lines
+        self.tree = TextTree([], self.ranks)
+        root = self.tree.root
+        root.children = [self._adopt(child, root) for child in self.children]
+        return self.tree
+
+    def _adopt(self, child, root):
+        if isinstance(child, str):
+            return child
+        if child.parent is self.parsed:
+            child.parent = root
+            return child
+        copy = Node(root, child.name)
+        copy.children = child.children.copy()
+        return copy
+
+    def _parse(self, lines, start, changed) -> bool:
+        '''Re-parse from checkpoint start until past changed lines'''
+        first, base = self.starts[start], self.counts[start]
+        delta = len(lines) - len(self.lines)
+        old = dict(zip(self.starts, self.counts))
+        starts, counts = self.starts[:start + 1], self.counts[:start + 1]
+        parser = TextTree([], self.ranks)
+        for number in range(first, len(lines)):
+            parser.process_events(tokenize([lines[number]]))
+            if parser.open_tags or parser.closing_tags:
+                continue
+            following = number + 1
+            starts.append(following)
+            counts.append(base + len(parser.root.children))
+            if following >= changed and following - delta in old:
+                end = old[following - delta]
+                shift = counts[-1] - end
+                rest = bisect_right(self.starts, following - delta)
+                starts.extend(line + delta for line in self.starts[rest:])
+                counts.extend(count + shift for count in self.counts[rest:])
+                break
+        else:
+            if parser.state == 'tagoff':
+                parser.rationalise()
+            end = len(self.children)
+        new = parser.root.children
+        self.parsed = parser.root
+        before, after = self.children[:base], self.children[end:]
+        if _merges(before, new) or _merges(new, after):
+            return False
+        self.children = before + new + after
+        self.starts, self.counts = starts, counts
+        return True
+
+
+def _common(old, new):
+    count = 0
+    for count, (a, b) in enumerate(zip(old, new), start=1):
+        if a != b:
+            return count - 1
+    return count
+
+
+def _merges(before, after):
+    '''Whether Node.add would have run the two sides together'''
+    return (before and after
+            and isinstance(before[-1], str) and isinstance(after[0], str)
+            and not before[-1].endswith('\n'))
+
+
+def tagged_lines(dump) -> list[str]:
+    '''The lines of a Tk dump, blank ones too, written out with their tags'''
+    text = ''.join([_tagged(key, value) for key, value, *_index in dump])
+    return text.removesuffix('\n').split('\n') if text else []
+
+
+def _tagged(key, value):
+    match key:
+        case 'text':
+            return value.replace('<', '&lt;').replace('>', '&gt;')
+        case 'tagon':
+            return f'<{value}>'
+        case 'tagoff':
+            return f'</{value}>'
+        case _:
+            return ''
@@ -2,10 +2,28 @@ from typing import Self
 
 
 class Node:
+    '''
+    Strings are memoised per node. A node whose string has been worked
+    out keeps a cache (or an empty one, if it was skipped), so a change
+    only has to clear caches upwards until it meets a node without one.
+    Call `changed` after renaming a node or editing its children by hand.
+    '''
+
+    __slots__ = ('parent', 'name', 'children', '_str', '_text', '_strings')
+
     def __init__(self, parent: Self = None, name: str = '') -> None:
         self.parent = parent
         self.name = name
         self.children = []
+        self._str = self._text = self._strings = None
+
+    def changed(self):
+        node = self
+        while node is not None and (node._str is not None or
+                                    node._text is not None or
+                                    node._strings is not None):
+            node._str = node._text = node._strings = None
+            node = node.parent
 
     @property
     def open_tag(self):
@@ -17,13 +35,21 @@ class Node:
 
     @property
     def middle_text(self):
-        return ''.join((str(child) for child in self.children))
+        return ''.join([str(child) for child in self.children])
 
     def __repr__(self):
         return f'Node object, name: {self.name}'
 
     def add(self, child):
-        self.children.append(child)
+        '''Add child, running it on from a previous string in the same line'''
+        children = self.children
+        if (isinstance(child, str) and children
+                and isinstance(last := children[-1], str)
+                and not last.endswith('\n')):
+            children[-1] = last + child
+        else:
+            children.append(child)
+        self.changed()
 
     def nodes(self):
         for child in self.children:
@@ -32,12 +58,28 @@ class Node:
                 yield from child.nodes()
 
     def stringify(self, skip=None):
-        return ''.join([self._strings(child, skip) for child in self.children])
+        if skip is None:
+            if self._text is None:
+                self._text = ''.join([
+                    child if isinstance(child, str) else child.stringify()
+                    for child in self.children])
+            return self._text
+        if self._strings is None:
+            self._strings = {}
+        try:
+            return self._strings[skip]
+        except KeyError:
+            string = ''.join([self._stringify(child, skip)
+                              for child in self.children])
+            return self._strings.setdefault(skip, string)
 
-    def _strings(self, child, skip=None):
+    @staticmethod
+    def _stringify(child, skip):
         if isinstance(child, str):
             return child
-        if child.name and child.name == skip:
+        if child.name == skip:
+            if child._strings is None:
+                child._strings = {}
             return ''
         return child.stringify(skip)
 
@@ -56,7 +98,9 @@ class Node:
         return self.children[-1]
 
     def __str__(self):
-        return f'{self.open_tag}{self.middle_text}{self.close_tag}'
+        if self._str is None:
+            self._str = f'{self.open_tag}{self.middle_text}{self.close_tag}'
+        return self._str
 
     def pprint(self, lvl=0):
         print(' ' * lvl + self.name.replace('\n', '\\n'))
@@ -0,0 +1,63 @@
+'''
+A streaming alternative to TextTree.
+
+Openers are only renamed by Tags.rationalise while they are still open,
+so once every tag opened at the top level has been closed and
+rationalised, the top-level nodes parsed so far are final. Stream hands
+each of them on as soon as that happens and forgets it, so a caller
+holds at most one top-level node at a time rather than the whole tree.
+'''
+
+from smeagol.conversion.text_tree.tags import Tags
+from smeagol.conversion.text_tree.tokenizer import tokenize
+
+
+class Stream(Tags):
+    def nodes(self, tokens):
+        '''Complete top-level nodes and strings, in document order'''
+        for key, value in tokens:
+            if key != self.state:
+                self.update_state(key)
+                yield from self._complete()
+            match key:
+                case 'tagon':
+                    self.tagon(value)
+                case 'text':
+                    self.text(value)
+                case 'tagoff':
+                    self.tagoff(value)
+        if self.state == 'tagoff':
+            self.rationalise()
+        yield from self._flush()
+
+    def _complete(self):
+        if self.open_tags or self.closing_tags:
+            return ()
+        return self._flush()
+
+    def _flush(self):
+        children, self.root.children = self.root.children, []
+        return children
+
+
+def nodes(text: list[str], ranks=None):
+    return Stream(ranks).nodes(tokenize(text))
+
+
+def events(text: list[str], ranks=None):
+    '''
+    ('tagon' | 'text' | 'tagoff', value) for text, with tags already
+    reordered as TextTree would nest them.
+    '''
+    for node in nodes(text, ranks):
+        yield from _events(node)
+
+
+def _events(node):
+    if isinstance(node, str):
+        yield 'text', node
+        return
+    yield 'tagon', node.name
+    for child in node.children:
+        yield from _events(child)
+    yield 'tagoff', node.name
@@ -0,0 +1,91 @@
+'''
+Ordered collections for Tags.rationalise.
+
+Closers come out lowest rank first, ties in the order they were closed,
+which is the order a stable sort by rank gives. Openers know where each
+name first occurs, so finding the opener to rename does not scan the
+whole group. Both use heaps with lazy deletion, so many tags closing at
+the same boundary cost O(n log n) rather than O(n²).
+'''
+
+from collections import deque
+from heapq import heappop, heappush
+from itertools import count
+
+
+class Openers(list):
+    '''One group of open tags, with the positions of each name'''
+
+    def __init__(self):
+        super().__init__()
+        self.positions = {}
+
+    def append(self, tag):
+        heappush(self.positions.setdefault(tag.name, []), len(self))
+        super().append(tag)
+
+    def first(self, name):
+        '''Position of the first tag called name, or None'''
+        positions = self.positions.get(name)
+        while positions:
+            position = positions[0]
+            if position < len(self) and self[position].name == name:
+                return position
+            heappop(positions)
+        return None
+
+    def swap(self, position):
+        '''Swap names between the tag at position and the last tag'''
+        tag, last = self[position], self[-1]
+        tag.name, last.name = last.name, tag.name
+        heappush(self.positions.setdefault(tag.name, []), position)
+        heappush(self.positions.setdefault(last.name, []), len(self) - 1)
+        tag.changed()
+        last.changed()
+
+
+class Closers:
+    '''Closing tags waiting to be rationalised, lowest rank first'''
+
+    def __init__(self, rank):
+        self.rank = rank
+        self.heap = []
+        self.names = {}
+        self.order = count()
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return (name for _rank, order, name in sorted(self.heap)
+                if self._live(order, name))
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def append(self, name):
+        order = next(self.order)
+        heappush(self.heap, (self.rank(name), order, name))
+        self.names.setdefault(name, deque()).append(order)
+        self.size += 1
+
+    def first(self):
+        while not self._live(*self.heap[0][1:]):
+            heappop(self.heap)
+        return self.heap[0][2]
+
+    def remove(self, name):
+        '''Remove the earliest closer called name'''
+        try:
+            self.names[name].popleft()
+        except (KeyError, IndexError) as e:
+            raise ValueError(name) from e
+        self.size -= 1
+        if not self.size:
+            self.heap.clear()
+            self.names.clear()
+
+    def _live(self, order, name):
+        orders = self.names[name]
+        return bool(orders) and order >= orders[0]
@@ -1,4 +1,5 @@
 from smeagol.conversion.text_tree.node import Node
+from smeagol.conversion.text_tree.tag_lists import Closers, Openers
 from smeagol.utilities import utils
 
 
@@ -9,7 +10,7 @@ class Tags:
         self.state: str = None
         self.root = Node()
         self.open_tags = []
-        self.closing_tags = []
+        self.closing_tags = Closers(self._rank)
 
     @property
     def opening_tags(self):
@@ -35,7 +36,7 @@ class Tags:
         self.state = state
 
     def open(self):
-        tags: list = []
+        tags = Openers()
         self.open_tags.append(tags)
         return tags
 
@@ -47,7 +48,6 @@ class Tags:
             self._rationalise()
 
     def _rationalise(self):
-        self.sort_closers()
         tag = self._rational_tag
         self.rename_opener(tag)
         try:
@@ -57,10 +57,6 @@ class Tags:
                              f'/ {self.open_tags}') from e
         self.remove_opener()
 
-    def sort_closers(self):
-        if len(self.opening_tags) >= len(self.closing_tags):
-            self.closing_tags.sort(key=self._rank)
-
     def _rank(self, tag):
         tag, _lang = utils.try_split(tag, '@')
         return self.rank.get(tag, 0)
@@ -68,16 +64,15 @@ class Tags:
     @property
     def _rational_tag(self):
         if len(self.opening_tags) >= len(self.closing_tags):
-            return self.closing_tags[0]
+            return self.closing_tags.first()
         return self.opening_tags[-1].name
 
     def rename_opener(self, name):
-        old_name = self.opening_tags[-1].name
-        self.opening_tags[-1].name = name
-        for tag in self.opening_tags:
-            if tag.name == name:
-                tag.name = old_name
-                return
+        '''Swap names between the last opener and the first named name'''
+        openers = self.opening_tags
+        position = openers.first(name)
+        if position is not None and position < len(openers) - 1:
+            openers.swap(position)
 
     def remove_opener(self):
         self.opening_tags.pop()
@@ -1,7 +1,5 @@
-import re
-
 from smeagol.conversion.text_tree.tags import Tags
-from smeagol.utilities import utils
+from smeagol.conversion.text_tree.tokenizer import dump_events, tokenize
 
 
 class TextTree(Tags):
@@ -34,38 +32,19 @@ class TextTree(Tags):
         return self.root.stringify()
 
     def process_tuples(self, text: list[tuple]):
-        self.retag_tuples(text)
-
-    def retag_tuples(self, text):
-        for elt in text:
-            self._retag(*elt)
+        self.process_events(dump_events(text))
 
     def process_strings(self, text: list[str]):
-        for line in text:
-            self._retag_line(line + '\n')
-
-    def _retag_line(self, line):
-        line = re.split('[<>]', line)
-        utils.alternate([self._text, self._tag], line)
-        # self._text('\n')
-
-    def _text(self, text):
-        self._retag('text', text)
-
-    def _tag(self, tag):
-        status = 'off' if tag.startswith('/') else 'on'
-        self._retag(f'tag{status}', tag.removeprefix('/'))
-
-    def _retag(self, key: str, value: str, _index=None) -> None:
-        if not value:
-            return
-        self.update_state(key)
-        match key:
-            case 'tagon':
-                self.tagon(value)
-            case 'text':
-                self.text(value)
-            case 'tagoff':
-                self.tagoff(value)
-            case _:
-                pass
+        self.process_events(tokenize(text))
+
+    def process_events(self, events):
+        for key, value in events:
+            if key != self.state:
+                self.update_state(key)
+            match key:
+                case 'tagon':
+                    self.tagon(value)
+                case 'text':
+                    self.text(value)
+                case 'tagoff':
+                    self.tagoff(value)
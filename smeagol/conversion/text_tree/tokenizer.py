@@ -0,0 +1,45 @@
+def tokenize(lines: list[str]):
+    '''
+    Yield ('text' | 'tagon' | 'tagoff', value) for each fragment of lines.
+
+    Fragments alternate between text and tag at each `<` or `>`, starting
+    afresh with text on every line, and a line's newline stays with its
+    last fragment. Raises TypeError before yielding if a line is not a
+    string.
+    '''
+    for line in lines:
+        tag = False
+        for fragment in (line + '\n').replace('>', '<').split('<'):
+            if tag:
+                if fragment[:1] == '/':
+                    if fragment != '/':
+                        yield 'tagoff', fragment[1:]
+                elif fragment:
+                    yield 'tagon', fragment
+            elif fragment:
+                yield 'text', fragment
+            tag = not tag
+
+
+def dump_events(dump: list[tuple]):
+    '''
+    Yield ('text' | 'tagon' | 'tagoff', value) for a Tk text dump in one
+    pass, skipping marks, empty values and the selection, and running
+    text together wherever Node.add would have.
+    '''
+    text = ''
+    for item in dump:
+        key, value = item[0], item[1]
+        if key == 'text':
+            if text[-1:] == '\n':
+                yield key, text
+                text = value
+            else:
+                text += value
+        elif key != 'mark' and value and value != 'sel':
+            if text:
+                yield 'text', text
+                text = ''
+            yield key, value
+    if text:
+        yield 'text', text
@@ -0,0 +1,163 @@
+'''
+Parsed TextTrees, kept on disk between sessions.
+
+A tree is stored as nested `(name, children)` tuples, with strings for
+text, marshalled on its own under a hash of its lines and of the ranks
+it was parsed with. Only trees that are asked for are unmarshalled, and
+rebuilding the nodes skips tagging and rationalising altogether.
+
+The file is kept beside the site's source, and SystemInterface saves to
+it. A save adds the trees parsed since to the file as it then finds it,
+through a temporary file of its own, so that processes sharing the file
+keep each other's trees. Build workers only read the file, and hand the
+trees they parse back to the parent to save. With no file, trees are
+kept for the session only.
+'''
+
+import hashlib
+import marshal
+import os
+import tempfile
+from itertools import islice
+
+from smeagol.conversion.text_tree.node import Node
+from smeagol.conversion.text_tree.text_tree import TextTree
+from smeagol.utilities import utils
+
+FORMAT = b'2'  # adjacent strings within a line are merged
+SUFFIX = '.trees'
+
+
+class TreeCache:
+    def __init__(self, filename: str = '', limit: int = 100000):
+        self.filename = filename
+        self.limit = limit
+        self._trees = None
+        self.used = set()
+        self.added = set()
+        self.hits = self.misses = 0
+
+    def __str__(self):
+        return f'Trees: {self.hits} hits, {self.misses} misses'
+
+    @property
+    def trees(self) -> dict:
+        if self._trees is None:
+            self._trees = self._load()
+        return self._trees
+
+    def _load(self) -> dict:
+        if not self.filename:
+            return {}
+        with utils.ignored(OSError, EOFError, ValueError, TypeError):
+            with open(self.filename, 'rb') as f:
+                return marshal.load(f)
+        return {}
+
+    def get(self, text, ranks=None) -> TextTree:
+        if not isinstance(text, list) or not all(
+                isinstance(line, str) for line in text):
+            return TextTree(text, ranks)
+        key = _key(text, ranks)
+        self.used.add(key)
+        try:
+            tree = build(marshal.loads(self.trees[key]), ranks)
+            self.hits += 1
+            return tree
+        except KeyError:
+            self.misses += 1
+            tree = TextTree(text, ranks)
+            self.trees[key] = marshal.dumps(compact(tree.root))
+            self.added.add(key)
+            return tree
+
+    def take(self):
+        '''Trees parsed and used since this was last taken, as absorb wants'''
+        added = {key: self.trees[key] for key in self.added}
+        used = list(self.used)
+        self.added.clear()
+        self.used.clear()
+        return added, used
+
+    def absorb(self, added: dict, used: list):
+        '''Keep trees another TreeCache parsed and used, as if here'''
+        self.trees.update(added)
+        self.added.update(added)
+        self.used.update(used)
+
+    def save(self):
+        '''
+        Add the trees parsed here to those on disk, which other processes
+        may have added to meanwhile. Trees used here go last, and the
+        least recently used go first once there are more than limit.
+        '''
+        if not (self.filename and self.added):
+            return
+        trees = self._load()
+        for key in self.used:
+            with utils.ignored(KeyError):
+                trees[key] = trees.pop(key, None) or self.trees[key]
+        if len(trees) > self.limit:
+            trees = dict(islice(trees.items(), len(trees) - self.limit, None))
+        folder = os.path.dirname(os.path.abspath(self.filename))
+        with utils.ignored(OSError):
+            os.makedirs(folder, exist_ok=True)
+            descriptor, temp = tempfile.mkstemp('.tmp', dir=folder)
+            try:
+                with open(descriptor, 'wb') as f:
+                    marshal.dump(trees, f)
+                os.replace(temp, self.filename)
+            finally:
+                with utils.ignored(OSError):
+                    os.remove(temp)
+            self.added.clear()
+
+    def clear(self):
+        self._trees = {}
+        self.used.clear()
+        self.added.clear()
+        self.hits = self.misses = 0
+        with utils.ignored(OSError):
+            os.remove(self.filename)
+
+
+def _key(text, ranks):
+    digest = hashlib.sha1(FORMAT)
+    digest.update('\n'.join(text).encode('utf-8'))
+    digest.update(repr(sorted((ranks or {}).items())).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def compact(node):
+    return (node.name, [child if isinstance(child, str) else compact(child)
+                        for child in node.children])
+
+
+def build(form, ranks=None) -> TextTree:
+    tree = TextTree([], ranks)
+    _fill(tree.root, form[1])
+    return tree
+
+
+def _fill(node, children):
+    for child in children:
+        if isinstance(child, str):
+            node.children.append(child)
+        else:
+            name, grandchildren = child
+            _fill(new := Node(node, name), grandchildren)
+            node.children.append(new)
+
+
+trees = TreeCache()
+
+
+def use(filename: str = '', limit: int = 100000) -> TreeCache:
+    '''Parse through a cache kept in filename from now on, and return it'''
+    global trees
+    trees = TreeCache(filename, limit)
+    return trees
+
+
+def parse(text, ranks=None) -> TextTree:
+    return trees.get(text, ranks)
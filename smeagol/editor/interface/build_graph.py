@@ -0,0 +1,182 @@
+'''
+What each saved page read as it rendered, kept beside the source file.
+
+Every page is kept with a digest of each thing it read: its own entry
+and any other whose contents, title or date it showed, the families
+its tables of contents listed, the pages its next and previous links
+point to, the order of the whole site if it repeated over it, and the
+year if it showed it.
+Templates, styles and links are digested together, and a change to any
+of them puts every page out of date. Otherwise a page is out of date
+if it is new, or if anything it read digests differently now.
+'''
+
+import hashlib
+import json
+import os
+from datetime import datetime as dt
+
+from smeagol.editor.interface.templates.template import family
+from smeagol.utilities import filesystem as fs
+from smeagol.utilities import utils
+
+SUFFIX = '.build'
+
+
+class BuildGraph:
+    def __init__(self, source: str, graph: dict = None):
+        self.filename = f'{source}{SUFFIX}' if source else ''
+        self._graph = graph
+        self.unsaved = False  # pages recorded or forgotten since saved
+
+    @property
+    def graph(self) -> dict:
+        if self._graph is None:
+            self._graph = {'assets': '', 'pages': {}}
+            with utils.ignored(FileNotFoundError, ValueError, TypeError):
+                self._graph.update(fs.load_json(self.filename))
+        return self._graph
+
+    def changed(self, site, names, assets: str) -> list:
+        '''Those of names whose pages are out of date'''
+        if assets != self.graph['assets']:
+            return list(names)
+        digests = Digests(site)
+        pages = self.graph['pages']
+        return [page for page in names
+                if _changed(pages.get(_key(page)), digests)]
+
+    def reads(self, names) -> set[tuple]:
+        '''What the page read when last recorded, as Context.read notes it'''
+        return {_read(json.loads(key))
+                for key in self.graph['pages'][_key(names)]}
+
+    def record(self, site, reads: dict, digests: 'Digests' = None):
+        '''Note what each page read, digested as the site stands now'''
+        digests = digests or Digests(site)
+        pages = self.graph['pages']
+        for names, page_reads in reads.items():
+            pages[_key(names)] = {key: digests[key]
+                                  for key in map(_key, page_reads)}
+            self.unsaved = True
+
+    def forget(self, names):
+        if self.graph['pages'].pop(_key(names), None) is not None:
+            self.unsaved = True
+
+    def save(self, assets: str = None):
+        '''
+        Write the graph. Given assets, every page is now up to date with
+        them; otherwise the assets are left as the last full build found
+        them, so pages written since are rebuilt if those have changed.
+        '''
+        if assets is not None:
+            self.graph['assets'] = assets
+        if self.filename:
+            fs.save_json(self.graph, self.filename)
+        self.unsaved = False
+
+
+class Digests(dict):
+    '''What each thing a page may read digests to, worked out once each'''
+
+    def __init__(self, site):
+        super().__init__()
+        self.site = site
+        self.links = {}
+
+    def __missing__(self, key):
+        return self.setdefault(key, _digest(self._value(*json.loads(key))))
+
+    def _value(self, kind, names=(), *args):
+        if kind == 'hierarchy':
+            return self.site.navigation.order
+        if kind == 'year':
+            return dt.now().year
+        try:
+            page = self.site.new(list(names))
+            match kind:
+                case 'entry':
+                    data = page.data.entries
+                    return [page.link, {k: v for k, v in data.items()
+                                        if v and k != 'children'}]
+                case 'next':
+                    return self._link(page.next_page().names)
+                case 'previous':
+                    return self._link(page.previous_page().names)
+                case 'family':
+                    return [[relative, self._link(relative)]
+                            for relative in family(page, args[0].split('-'))]
+        except (KeyError, IndexError, ValueError, AttributeError):
+            pass
+        return None
+
+    def _link(self, names):
+        key = tuple(names)
+        try:
+            return self.links[key]
+        except KeyError:
+            link = utils.link(self.site.new(list(names)))
+            return self.links.setdefault(key, link)
+
+
+def assets(config: dict) -> str:
+    '''One digest of every template, style and link file in config'''
+    filenames = [config.get('styles', ''), *config.get('links', {}).values()]
+    templates = list(_filenames(config.get('templates', {})))
+    while templates:
+        filename = templates.pop()
+        if filename in filenames or not os.path.isfile(filename):
+            continue
+        filenames.append(filename)
+        template = fs.load_yaml(filename) or {}
+        templates.extend(_filenames(template.get('templates', {})))
+    return _digest([[filename, _file(filename)]
+                    for filename in sorted(filenames)])
+
+
+def _filenames(templates):
+    match templates:
+        case str():
+            yield templates
+        case dict():
+            for value in templates.values():
+                yield from _filenames(value)
+
+
+def _file(filename):
+    with utils.ignored(OSError):
+        with open(filename, 'rb') as f:
+            return hashlib.sha1(f.read()).hexdigest()
+    return None
+
+
+def key(names, reads, digests: Digests, assets: str) -> str:
+    '''
+    One digest of the page's names, and of reads as they stand now,
+    together with the assets. The names stand for what the page shows
+    of itself without reading it, such as its name and its self-links.
+    '''
+    keys = sorted(map(_key, reads))
+    return _digest([assets, list(names),
+                    *([key, digests[key]] for key in keys)])
+
+
+def _read(dependency):
+    return tuple(tuple(arg) if isinstance(arg, list) else arg
+                 for arg in dependency)
+
+
+def _changed(reads, digests):
+    if reads is None:
+        return True
+    return any(digests[key] != digest for key, digest in reads.items())
+
+
+def _key(obj):
+    return json.dumps(obj, ensure_ascii=False)
+
+
+def _digest(value):
+    text = json.dumps(value, ensure_ascii=False, default=str)
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
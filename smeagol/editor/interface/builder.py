@@ -0,0 +1,133 @@
+'''
+Pages rendered and written across worker processes.
+
+Each worker loads the site and its templates once, from the interface's
+config and site data, then renders whole chunks of pages in the order
+the serial build would. The parent only hands out chunks, counts the
+pages as they are written and gathers what each one read, which files
+it wrote or left unchanged, how often the render cache was hit, and the
+trees each worker parsed, which only the parent saves.
+'''
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+
+from smeagol.conversion.text_tree import tree_cache
+from smeagol.conversion.text_tree.tree_cache import TreeCache
+from smeagol.editor.interface import assets
+from smeagol.editor.interface.build_graph import BuildGraph
+from smeagol.editor.interface.output import Output
+from smeagol.editor.interface.render_cache import RenderCache
+from smeagol.editor.interface.templates.template_store import TemplateStore
+from smeagol.site.site import Site
+from smeagol.utilities import filesystem as fs
+from smeagol.widgets.styles.styles import Styles
+
+CHUNKS = 20  # per worker, so progress moves in steps of about 5%
+
+
+@dataclass
+class Build:
+    config: dict
+    site: dict  # as SystemInterface.save_site would write it
+    directory: str
+    files: dict  # the Output's manifest
+    streaming: bool = False
+    compiled: bool = True
+    page_cache: int = 1000
+    renders: tuple = None  # a RenderCache's folder and limit
+    graph: dict = None  # a BuildGraph's, for the render cache's keys
+    assets: str = ''
+    trees: str = ''  # the TreeCache's file, which workers only read
+
+
+_worker = {}
+
+
+def write(store: TemplateStore, output: Output, entry,
+          reads: set = None, cache: RenderCache = None) -> str:
+    filename = os.path.join(output.directory, entry.url)
+    try:
+        if cache is None:
+            html = store.html(entry, reads)
+        else:
+            html = cache.html(store, entry, reads)
+    except (ValueError, IndexError, TypeError) as e:
+        raise type(e)(f'Incorrect formatting in entry {entry.name}') from e
+    output.save(html, filename)
+    return filename
+
+
+def serially(store: TemplateStore, output: Output, site: Site, names,
+             reads: dict = None, cache: RenderCache = None):
+    '''Write each page in turn, yielding how many are done before each'''
+    reads = {} if reads is None else reads
+    for done, page in enumerate(names):
+        yield done
+        write(store, output, site.new(list(page)),
+              reads.setdefault(tuple(page), set()), cache)
+
+
+def in_parallel(build: Build, output: Output, names, workers: int,
+                reads: dict = None, cache: RenderCache = None,
+                trees: TreeCache = None):
+    '''Write chunks of pages across workers, yielding how many are done'''
+    reads = {} if reads is None else reads
+    workers = workers or os.cpu_count()
+    size = max(1, len(names) // (workers * CHUNKS))
+    chunks = [names[i:i + size] for i in range(0, len(names), size)]
+    done = 0
+    with ProcessPoolExecutor(workers, initializer=start,
+                             initargs=(build,)) as pool:
+        futures = [pool.submit(save, chunk) for chunk in chunks]
+        for future in as_completed(futures):
+            chunk, saved, renders, parsed = future.result()
+            reads.update(chunk)
+            output.absorb(*saved)
+            if cache is not None:
+                cache.absorb(*renders)
+            if trees is not None:
+                trees.absorb(*parsed)
+            done += len(chunk)
+            yield done
+
+
+def progress(done, total: int, each: int = 5):
+    '''Percentages at about every each percent of total, then 100'''
+    percent = each
+    for count in done:
+        if 100 * count / total >= percent and count < total:
+            yield 100 * count // total
+            while 100 * count / total >= percent:
+                percent += each
+    yield 100
+
+
+def start(build: Build):
+    tree_cache.use(build.trees)
+    links = {name: fs.load_yaml(filename)
+             for name, filename in build.config.get('links', {}).items()}
+    styles = Styles(fs.load_yaml(build.config.get('styles', '')), links=links)
+    templates = assets.Templates(build.config.get('templates', {}))
+    _worker['store'] = TemplateStore(
+        templates, styles, build.streaming, build.compiled)
+    _worker['site'] = Site(**build.site, page_cache=build.page_cache)
+    _worker['output'] = Output(build.directory, files=build.files)
+    _worker['cache'] = build.renders and RenderCache(*build.renders).start(
+        _worker['site'], BuildGraph('', build.graph), build.assets)
+
+
+def save(chunk):
+    '''
+    Write each page in chunk, returning what each one read and saved,
+    the render cache's hits and misses, and the trees parsed and used
+    '''
+    store, site, output = _worker['store'], _worker['site'], _worker['output']
+    cache = _worker['cache']
+    reads = {}
+    for names in chunk:
+        write(store, output, site.new(list(names)),
+              reads.setdefault(tuple(names), set()), cache)
+    return (reads, output.take(), cache.take() if cache else (0, 0),
+            tree_cache.trees.take())
@@ -29,6 +29,7 @@ class Interfaces:
         message = askstring('Git commit message', 'What did you do today?')
         for interface in self.interfaces.values():
             interface.save()
+            interface.compact()
             interface.save_special_files()
             interface.push_repo(message)
 
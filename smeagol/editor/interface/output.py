@@ -0,0 +1,105 @@
+'''
+Pages written to the site's directory only where their html has changed.
+
+A manifest beside the source file keeps each page's digest, size and
+mtime as last written. A page whose file still has that size and mtime
+is taken to hold what the manifest says; otherwise the file itself is
+read and digested, so an unchanged page is never rewritten, even with
+the manifest lost. Pages in the manifest that a whole build did not
+write belong to entries that have gone, and are deleted.
+'''
+
+import hashlib
+import os
+
+from smeagol.utilities import filesystem as fs
+from smeagol.utilities import utils
+
+SUFFIX = '.output'
+
+
+class Output:
+    def __init__(self, directory: str, source: str = '', files: dict = None):
+        self.directory = directory
+        self.filename = f'{source}{SUFFIX}' if source else ''
+        self._files = files
+        self.kept = {}  # pages written or found unchanged since finish
+        self.written = self.unchanged = self.deleted = 0
+
+    @property
+    def files(self) -> dict:
+        if self._files is None:
+            self._files = {}
+            with utils.ignored(FileNotFoundError, ValueError, TypeError):
+                manifest = fs.load_json(self.filename)
+                if manifest.get('directory') == self.directory:
+                    self._files = manifest['files']
+        return self._files
+
+    def save(self, html: str, filename: str) -> bool:
+        '''Write html to filename unless it holds it already'''
+        path = os.path.relpath(filename, self.directory)
+        digest = _digest(html)
+        if self._holds(filename, self.files.get(path), digest):
+            self.unchanged += 1
+            written = False
+        else:
+            fs.save_string(html, filename)
+            self.written += 1
+            written = True
+        stat = os.stat(filename)
+        self.kept[path] = [digest, stat.st_size, stat.st_mtime_ns]
+        return written
+
+    @staticmethod
+    def _holds(filename, record, digest):
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            return False
+        if record and record[1:] == [stat.st_size, stat.st_mtime_ns]:
+            return record[0] == digest
+        return _digest(fs.load_string(filename)) == digest
+
+    def forget(self, filename):
+        '''Count a page as deleted, and drop it from the manifest'''
+        path = os.path.relpath(filename, self.directory)
+        self.files.pop(path, None)
+        self.kept.pop(path, None)
+        self.deleted += 1
+
+    def take(self):
+        '''What has been saved since this was last taken, as absorb wants'''
+        taken = self.kept, self.written, self.unchanged
+        self.kept, self.written, self.unchanged = {}, 0, 0
+        return taken
+
+    def absorb(self, kept: dict, written: int, unchanged: int):
+        '''Count pages another Output saved, as if saved here'''
+        self.kept.update(kept)
+        self.written += written
+        self.unchanged += unchanged
+
+    def finish(self, clean=False) -> dict:
+        '''
+        Note the pages saved since the last finish in the manifest, and
+        count them. If clean, delete any other page the manifest holds.
+        '''
+        if clean:
+            for path in set(self.files) - set(self.kept):
+                fs.delete_file(os.path.join(self.directory, path))
+                del self.files[path]
+                self.deleted += 1
+        self.files.update(self.kept)
+        counts = {'written': self.written, 'unchanged': self.unchanged,
+                  'deleted': self.deleted}
+        self.take()
+        self.deleted = 0
+        if self.filename:
+            fs.save_json({'directory': self.directory, 'files': self.files},
+                         self.filename)
+        return counts
+
+
+def _digest(html: str):
+    return hashlib.sha1(html.encode('utf-8')).hexdigest()
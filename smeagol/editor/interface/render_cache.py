@@ -0,0 +1,128 @@
+'''
+Rendered pages kept on disk from one session to the next.
+
+A page is kept under a digest of everything its html can depend on: the
+templates, styles and links, the page's own names, and each thing the
+page read as the build graph recorded it, digested as the site stands
+now. A page renders the
+same from the same inputs, so html found under that digest is the html
+the page would render to. Pages are kept compressed, one file each, and
+those least recently used are deleted once the folder outgrows its
+limit. Files are touched when used, so the order outlasts the session.
+'''
+
+import os
+import zlib
+
+from smeagol.editor.interface.build_graph import BuildGraph, Digests, key
+from smeagol.utilities import filesystem as fs
+from smeagol.utilities import utils
+
+SUFFIX = '.renders'
+
+
+class RenderCache:
+    def __init__(self, folder: str, limit: int = 1 << 28):
+        self.folder = folder
+        self.limit = limit
+        self.hits = self.misses = 0
+        self._sizes = None  # in order of last use, oldest first
+        self.size = 0
+        self.graph = self.digests = self.assets = None
+
+    def __str__(self):
+        return f'Renders: {self.hits} hits, {self.misses} misses'
+
+    def start(self, site, graph: BuildGraph, assets: str):
+        '''Key pages by what they read last in graph, as they stand now'''
+        self.graph, self.digests, self.assets = graph, Digests(site), assets
+        self.hits = self.misses = 0
+        return self
+
+    def take(self):
+        '''Hits and misses since this was last taken, as absorb wants'''
+        taken = self.hits, self.misses
+        self.hits = self.misses = 0
+        return taken
+
+    def absorb(self, hits: int, misses: int):
+        '''Count hits and misses another RenderCache had, as if here'''
+        self.hits += hits
+        self.misses += misses
+
+    def html(self, store, entry, reads: set):
+        '''entry's html from the folder if kept, else rendered and kept'''
+        with utils.ignored(KeyError):
+            page_reads = self.graph.reads(entry.names)
+            html = self.get(self._key(entry, page_reads))
+            reads |= page_reads
+            self.hits += 1
+            return html
+        self.misses += 1
+        page_reads = set()
+        html = store.html(entry, page_reads)
+        self.add(self._key(entry, page_reads), html)
+        reads |= page_reads
+        return html
+
+    def _key(self, entry, reads):
+        return key(entry.names, reads, self.digests, self.assets)
+
+    @property
+    def sizes(self) -> dict:
+        if self._sizes is None:
+            files = []
+            with utils.ignored(OSError):
+                for folder in os.scandir(self.folder):
+                    if folder.is_dir():
+                        files += map(_stat, os.scandir(folder.path))
+            self._sizes = {name: size for _mtime, name, size in sorted(files)
+                           if not name.endswith('.tmp')}
+            self.size = sum(self._sizes.values())
+        return self._sizes
+
+    def _filename(self, name):
+        return os.path.join(self.folder, name[:2], name)
+
+    def get(self, name: str) -> str:
+        size = self.sizes.pop(name)
+        self.sizes[name] = size
+        filename = self._filename(name)
+        try:
+            with open(filename, 'rb') as f:
+                html = zlib.decompress(f.read()).decode('utf-8')
+            os.utime(filename)
+        except (OSError, zlib.error) as e:
+            self._remove(name)
+            raise KeyError(name) from e
+        return html
+
+    def add(self, name: str, html: str):
+        data = zlib.compress(html.encode('utf-8'), 1)
+        filename = self._filename(name)
+        fs.makedirs(filename)
+        with utils.ignored(OSError):
+            with open(temp := f'{filename}.tmp', 'wb') as f:
+                f.write(data)
+            os.replace(temp, filename)
+            self._remove(name)
+            self.sizes[name] = len(data)
+            self.size += len(data)
+        while self.size > self.limit and self.sizes:
+            self._remove(next(iter(self.sizes)), delete=True)
+
+    def _remove(self, name, delete=False):
+        size = self.sizes.pop(name, 0)  # sizes first, as it may set size
+        self.size -= size
+        if delete:
+            fs.delete_file(self._filename(name))
+
+    def clear(self):
+        for name in list(self.sizes):
+            self._remove(name, delete=True)
+        self.hits = self.misses = 0
+
+
+def _stat(file):
+    stat = file.stat()
+    return stat.st_mtime_ns, file.name, stat.st_size
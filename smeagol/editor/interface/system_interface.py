@@ -5,9 +5,13 @@ import re
 from git import Repo
 from git.exc import GitCommandError, InvalidGitRepositoryError
 
-from smeagol.editor.interface import assets
+from smeagol.conversion.text_tree import tree_cache
+from smeagol.editor.interface import (assets, build_graph, builder, output,
+                                      render_cache)
 from smeagol.editor.interface.templates.template_store import TemplateStore
+from smeagol.site import journal, shards
 from smeagol.site.site import Site
+from smeagol.site.tree_store import TreeStore
 from smeagol.utilities import filesystem as fs
 from smeagol.utilities import utils
 from smeagol.utilities.tinellbian_sort import SerialNumberer
@@ -23,6 +27,8 @@ class SystemInterface:
     def __init__(self, filename='', server=True):
         self.filename = filename
         self.styles = self.files = self.links = self.template_store = None
+        self.journal = self.build_graph = self.output = None
+        self.render_cache = self.trees = None
         self.repo = self.create_repo(filename)
         self.pull_repo()
         self.config = self.load_config(filename) if filename else {}
@@ -59,17 +65,41 @@ class SystemInterface:
     def open_assets(self):
         self.links = self.open_link_files(self._links)
         self.open_styles()
-        self.template_store = TemplateStore(self.templates, self.styles)
+        self.template_store = TemplateStore(
+            self.templates, self.styles, self.stream_entries,
+            self.compile_templates)
         self.files = fs.load_yaml(self._files)
 
     def open_site(self):
-        self._site_data = fs.load_yaml(self.assets.source)
+        source = self.assets.source
+        self.trees = tree_cache.use(source and f'{source}{tree_cache.SUFFIX}')
+        if shards.is_sharded(source):
+            self._site_data = shards.load_source(source)
+        else:
+            self._site_data = fs.load_yaml(source, snapshot=self.snapshots)
+        if self.compact_tree:
+            directory = self._site_data.get('directory')
+            self._site_data['directory'] = TreeStore(directory).root
         self.site = Site(**self._site_data,
-                    serialisation_format=self.serialisation_format)
+                    serialisation_format=self.serialisation_format,
+                    page_cache=self.page_cache)
+        self.open_journal(source)
+        self.build_graph = build_graph.BuildGraph(source)
+        self.output = output.Output(self.locations.directory, source)
+        if self.filename and self.render_cache_size:
+            self.render_cache = render_cache.RenderCache(
+                f'{self.filename}{render_cache.SUFFIX}', self.render_cache_size)
+
+    def open_journal(self, source):
+        if not (source and self.journal_size):
+            return
+        self.journal = journal.Journal(source, self.journal_size)
+        if journal.replay(self.site, self.journal.records()):
+            self.sort_dictionary()
 
     def open_styles(self):
-        styles = self.load_from_config('styles')
-        imes = {name: fs.load_yaml(filename)
+        styles = self.load_from_config('styles', snapshot=self.snapshots)
+        imes = {name: fs.load_yaml(filename, snapshot=self.snapshots)
                 for name, filename in self._imes.items()}
         try:
             self.styles = Styles(styles, imes, self.links)
@@ -98,6 +128,22 @@ class SystemInterface:
             case 'assets' | 'locations' | 'templates':
                 value = getattr(assets, attr.title())(
                     self.config.get(attr, {}))
+            case 'compact_tree':
+                value = self.config.get('compact tree', False)
+            case 'snapshots':
+                value = self.config.get('snapshot cache', True)
+            case 'stream_entries':
+                value = self.config.get('stream entries', False)
+            case 'compile_templates':
+                value = self.config.get('compile templates', True)
+            case 'journal_size':
+                value = self.config.get('journal size', 1 << 20)
+            case 'page_cache':
+                value = self.config.get('page cache', 1000)
+            case 'build_workers':
+                value = self.config.get('build workers', 1)
+            case 'render_cache_size':
+                value = self.config.get('render cache', 1 << 28)
             case 'serialisation_format':
                 value = self.config.get('serialisation format', {}).copy()
             case '_links':
@@ -112,7 +158,8 @@ class SystemInterface:
         return value
 
     def open_link_files(self, links: dict):
-        return {key: fs.load_yaml(filename) for key, filename in links.items()}
+        return {key: fs.load_yaml(filename, snapshot=self.snapshots)
+                for key, filename in links.items()}
 
     @property
     def port(self):
@@ -150,46 +197,144 @@ class SystemInterface:
     def add_entry_to_site(self, entry):
         self.site.add_entry(entry)
         self.sort_dictionary()
+        if self.journal:
+            self.journal.add(entry.names)
 
-    def load_from_config(self, attr, default_obj=None):
-        return fs.load_yaml(self.config.get(attr, ''), default_obj)
+    def load_from_config(self, attr, default_obj=None, snapshot=False):
+        return fs.load_yaml(self.config.get(attr, ''), default_obj, snapshot)
 
     def save_config(self):
         if self.filename:
             fs.save_yaml(self.config, self.filename)
 
+    @property
+    def site_data(self):
+        site_data = self._site_data
+        with utils.ignored(AttributeError):  # directory is a tree_store.Branch
+            directory = site_data.get('directory').tolist()
+            site_data = {**site_data, 'directory': directory}
+        return site_data
+
     def save_site(self, filename=None):
         filename = filename or self.assets.source
-        fs.save_yaml(self._site_data, filename)
+        site_data = self.site_data
+        if shards.is_sharded(filename):
+            shards.save_source(site_data, filename, sync=True)
+        else:
+            fs.save_yaml(site_data, temp := f'{filename}.tmp', sync=True)
+            try:
+                fs.replace(temp, filename)
+            except FileNotFoundError:
+                return  # nothing written, so the journal still holds the edits
+        if self.journal and filename == self.assets.source:
+            self.journal.clear()
+
+    def save_site_entry(self, entry):
+        '''Record one entry's edits, without rewriting the whole source'''
+        if not self.journal:
+            return self.save_site()
+        self.journal.set(entry.names, entry.data.entries)
+        if self.journal.full:
+            self.save_site()
+        return None
+
+    def compact(self):
+        '''
+        Fold any journalled edits into the source, and keep the graph and
+        the trees parsed since
+        '''
+        if self.journal and self.journal.size:
+            self.save_site()
+        if self.build_graph.unsaved:
+            self.build_graph.save()
+        self.trees.save()
 
     def open_entry_in_browser(self, entry):
         fs.open_in_browser(self.port, entry.url)
         return 'break'
 
     def save_entries(self):
-        total = len(self.site)
-        percent = each = 5
-        for i, entry in enumerate(reversed(list(self.site))):
-            if 100*i/total >= percent:
-                yield 100*i // total
-                percent += each
-            filename, saved = self.save_entry(entry)
-            if not saved:
+        yield from self._save_entries(self.delete_empty_entries(), clean=True)
+
+    def save_changed(self, dry_run=False):
+        '''
+        Save only the entries whose pages are out of date, and list their
+        files. With dry_run, only list them.
+        '''
+        if dry_run:
+            names = list(reversed(list(self.site.iternames())))
+        else:
+            names = self.delete_empty_entries()
+        assets_digest = build_graph.assets(self.config)
+        names = self.build_graph.changed(self.site, names, assets_digest)
+        if not dry_run:
+            for _percentage in self._save_entries(names):
+                pass
+        directory = self.locations.directory
+        return [os.path.join(directory, self.site.new(list(entry_names)).url)
+                for entry_names in names]
+
+    def _save_entries(self, names, clean=False):
+        reads = {}
+        assets_digest = build_graph.assets(self.config)
+        cache = self.render_cache and self.render_cache.start(
+            self.site, self.build_graph, assets_digest)
+        if self.build_workers == 1:
+            done = builder.serially(self.template_store, self.output,
+                                    self.site, names, reads, cache)
+        else:
+            build = builder.Build(
+                self.config, self.site_data, self.output.directory,
+                self.output.files, self.stream_entries,
+                self.compile_templates, self.page_cache,
+                cache and (cache.folder, cache.limit),
+                self.build_graph.graph, assets_digest, self.trees.filename)
+            done = builder.in_parallel(build, self.output, names,
+                                       self.build_workers, reads, cache,
+                                       self.trees)
+        yield from builder.progress(done, len(names))
+        self.build_graph.record(self.site, reads, cache and cache.digests)
+        self.build_graph.save(assets_digest)
+        self.trees.save()
+        counts = self.output.finish(clean)
+        print(', '.join(f'{count} {name}' for name, count in counts.items()))
+        if cache:
+            print(cache)
+
+    def delete_empty_entries(self):
+        '''Delete empty entries, children first, and list the rest'''
+        names = []
+        for entry_names in reversed(list(self.site.iternames())):
+            entry = self.site.new(list(entry_names))
+            filename = os.path.join(self.locations.directory, entry.url)
+            if self.delete_entry(entry, filename):
                 print(f'Deleting {filename}')
-        yield 100
+            else:
+                names.append(entry_names)
+        return names
+
+    def delete_entry(self, entry, filename):
+        try:
+            self.site.remove_entry(entry)
+        except IndexError:
+            return False
+        if self.journal:
+            self.journal.remove(entry.names)
+        self.build_graph.forget(entry.names)
+        self.output.forget(filename)
+        fs.delete_file(filename)
+        return True
 
     def save_entry(self, entry, copy_all=False):
         filename = os.path.join(
             self.locations.directory, entry.url)
-        with utils.ignored(IndexError):
-            self.site.remove_entry(entry)
-            fs.delete_file(filename)
+        if self.delete_entry(entry, filename):
+            self.output.finish()
             return (filename, False)
-        try:
-            html = self.template_store.html(entry)
-        except (ValueError, IndexError, TypeError) as e:
-            raise type(e)(f'Incorrect formatting in entry {entry.name}') from e
-        fs.save_string(html, filename)
+        reads = set()
+        builder.write(self.template_store, self.output, entry, reads)
+        self.output.finish()  # not clean: other pages were not written
+        self.build_graph.record(self.site, {tuple(entry.names): reads})
         if copy_all:
             self.copy_all()
         return (filename, True)
@@ -0,0 +1,85 @@
+'''
+Tags compiled once for each set of styles.
+
+Template._html used to look each node's tag up in Styles, and every
+page then re-read the tag's strings through Tag.__getattr__, found its
+render method by catching AttributeError, and split its param on `$`.
+A CompiledTag works all of that out the first time its name is seen, so
+rendering a node is a dictionary lookup and a call to a bound method.
+Each CompiledTag keeps its own copy of its style in its own language,
+so nothing is written to the shared style while a page renders.
+'''
+
+from collections import namedtuple
+
+from smeagol.utilities.types import Styles
+
+Hierarchy = namedtuple('Hierarchy', 'rank start end')
+
+
+class CompiledTag:
+    def __init__(self, styles: Styles, name: str):
+        style = self.style = styles.select(name)
+        self.language = style.language_code
+        self.type = style.type
+        self.block = style.block
+        self.start, self.pipe, self.end = style.start, style.pipe, style.end
+        self.open, self.close = style.open, style.close
+        self.param = style.param
+        self.params = self.param.split('$')
+        self.hierarchy = _hierarchy(style.hierarchy)
+        self.method = None
+        self._copies = {}
+
+    def __getattr__(self, attr):
+        return getattr(self.style, attr)
+
+    def function(self, template):
+        '''The Template method that renders this tag'''
+        if self.method is None:
+            try:
+                getattr(template, self.type)
+                self.method = self.type
+            except AttributeError:
+                self.method = 'block' if self.block else 'span'
+        return getattr(template, self.method)
+
+    def decode_param(self, options):
+        return self.style.decode_param(options, self.params)
+
+    def incremented_copy(self, level):
+        try:
+            return self._copies[level]
+        except KeyError:
+            copy = self.style.incremented_copy(level)
+            return self._copies.setdefault(level, copy)
+
+
+class CompiledStyles(dict):
+    '''CompiledTags by name, each made the first time it is asked for'''
+
+    def __init__(self, styles: Styles):
+        super().__init__()
+        self.styles = styles
+
+    def __missing__(self, name):
+        try:
+            tag = CompiledTag(self.styles, name)
+        except KeyError as e:
+            raise KeyError(f'Tag {name} does not exist') from e
+        return self.setdefault(name, tag)
+
+
+def compile_tree(tree, tags: CompiledStyles):
+    '''Compile the tags in tree now rather than on the first page'''
+    for node in tree.nodes():
+        try:
+            tags[node.name]
+        except KeyError:
+            pass  # raised again if the node is ever rendered
+
+
+def _hierarchy(hierarchy):
+    if not hierarchy.rank:
+        return Hierarchy(hierarchy.rank, '', '')
+    return Hierarchy(hierarchy.rank, hierarchy.start, hierarchy.end)
@@ -0,0 +1,111 @@
+'''
+Rendered template sections, kept for as long as their TemplateStore.
+
+Each section is read once to find what its html can depend on, besides
+the components it is given and the line state it starts in:
+
+    static  nothing else
+    site    the root's name or the year, so pages share it
+    level   the page's level, for headings in whole-page components
+    page    anything else, so it is rendered afresh every time
+
+A section is also rendered afresh if it holds anchors, which become
+self-links on the page they point to. Whatever a kept section read as
+it rendered, such as the year, is noted again on each page that uses it.
+'''
+
+from datetime import datetime as dt
+
+from smeagol.editor.interface.templates.template import ANCHOR, page_links
+from smeagol.utilities import utils
+
+STATIC, SITE, LEVEL, PAGE = 'static', 'site', 'level', 'page'
+PAGE_DATA = {'contents', 'name', 'entry-title', 'title'}
+
+
+class Fragments:
+    def __init__(self, templates):
+        self.templates = templates
+        self.scopes = {}
+        self.html = {}
+
+    def clear(self):
+        self.scopes.clear()
+        self.html.clear()
+
+    def key(self, name, components, context):
+        '''Where the html is kept, or None if it must be rendered afresh'''
+        scopes = self.scope(name)
+        if PAGE in scopes:
+            return None
+        page = context.page
+        key = [name, components.start, components.pipe, components.end,
+               components.wholepage, context.started.tag]
+        if SITE in scopes:
+            key += [page.root.name, dt.now().year]
+        if LEVEL in scopes and components.wholepage:
+            key += [page.level]
+        return tuple(key)
+
+    def get(self, key, context):
+        html, tag, reads = self.html[key]
+        context.started.update(tag)
+        context.reads |= reads
+        return html
+
+    def add(self, key, html, context, reads):
+        if key is not None:
+            self.html[key] = html, context.started.tag, reads
+
+    def scope(self, name):
+        try:
+            return self.scopes[name]
+        except KeyError:
+            self.scopes[name] = {PAGE}  # until worked out, or if recursive
+            scopes = self._scope(name)
+            self.scopes[name] = scopes
+            return scopes
+
+    def _scope(self, name):
+        if name == 'main':
+            return {PAGE}
+        try:
+            template = self.templates[name]
+        except KeyError:
+            return {STATIC}
+        tags = self.templates.tags(template.styles)
+        select = template.styles.select if tags is None else tags.__getitem__
+        scopes = {STATIC}
+        for tree in (template.text, template.title):
+            for node in tree.nodes():
+                try:
+                    scopes |= self._node(node, select(node.name))
+                except (KeyError, IndexError, AttributeError):
+                    scopes.add(PAGE)  # left to fail as it renders
+        return scopes
+
+    def _node(self, node, tag):
+        if tag.open.endswith(ANCHOR[0]):
+            return {PAGE}
+        scopes = {PAGE} if page_links(tag.param) else set()
+        match tag.type:
+            case 'data':
+                return scopes | _data(node.first_child)
+            case 'template':
+                name = node.first_child.lower().replace(' ', '')
+                return scopes | self.scope(name)
+            case 'heading':
+                return scopes | {LEVEL}
+            case 'toc' | 'repeat':
+                return {PAGE}
+            case _other:
+                return scopes
+
+
+def _data(value):
+    function, _parameter = utils.try_split(value, '|')
+    if value in PAGE_DATA or function == 'date':
+        return {PAGE}
+    if value in ('root', 'year'):
+        return {SITE}
+    return set()
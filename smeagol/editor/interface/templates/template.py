@@ -1,14 +1,20 @@
 import re
-from dataclasses import dataclass
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime as dt
+from functools import cache, cached_property, partial
 from typing import Self, Optional
 
 from smeagol.utilities import utils
-from smeagol.utilities.types import Styles, Tag, TemplateStore, TextTree
+from smeagol.utilities.types import (Page, Styles, Tag, TemplateStore,
+                                     TextTree)
 from smeagol.conversion.text_tree.node import Node
 
 # pylint: disable=R0903
 
+ANCHOR = '<a href="', '</a>'
+PAGE_LINKS = 'next', 'previous'
+
 
 @dataclass
 class Components:
@@ -25,6 +31,41 @@ class Components:
             self.wholepage
         )
 
+
+@dataclass
+class Context:
+    '''
+    Everything that changes while one page renders. Templates and their
+    store only read shared state, so pages may render at the same time.
+    '''
+    page: Page = None  # moved on by repeat
+    contents: 'Template' = None  # rendered by <template>main</template>
+    written: Page = None  # the page whose file is being made
+    started: utils.Flag = field(default_factory=utils.Flag)
+    hierarchy: list[str] = field(default_factory=list)
+    components: Components = field(default_factory=Components)
+    reads: set[tuple] = field(default_factory=set)  # see build_graph
+
+    @cached_property
+    def href(self) -> str:
+        '''How an anchor to the page being written starts its text'''
+        return f'{self.written.name}.html'
+
+    def read(self, *dependency):
+        '''Note something besides the templates that the html depends on'''
+        self.reads.add(dependency)
+
+    @contextmanager
+    def template(self, components: Components):
+        '''A hierarchy and components of its own for one template'''
+        outer = self.hierarchy, self.components
+        self.hierarchy, self.components = [], components
+        try:
+            yield self
+        finally:
+            self.hierarchy, self.components = outer
+
+
 def cells(text):
     segments = text.split('|')
     final = len(segments) - 1
@@ -45,6 +86,40 @@ def cell(text, index, final):
     return f'<t{d}{spans}>{text}</t{d}>'
 
 
+@cache
+def page_links(param: str) -> tuple[str]:
+    '''Which of the neighbouring pages a tag's param links to'''
+    links = []
+    for name in param.split('$')[1::2]:
+        _function, name = utils.try_split(name, '(', name)
+        name, _arg = utils.try_split(name.removesuffix(')'), ':')
+        if name in PAGE_LINKS:
+            links.append(name)
+    return tuple(links)
+
+
+def family(page, groups):
+    '''Names in page's family groups, in the order of the site'''
+    try:
+        return page.navigation.ordered(page.relatives(groups))
+    except ValueError:
+        return page.root.navigation.ordered(page.root.relatives(groups))
+
+
+def self_link(open_: str, text: str, close: str, href: str):
+    '''An anchor opened by open_ whose text starts href, as a span, or None'''
+    if not (open_.endswith(ANCHOR[0]) and close.startswith(ANCHOR[1])):
+        return None
+    if '\n' in text:
+        return None
+    _fragment, pipe, label = text.removeprefix(href).partition('">')
+    if not pipe:
+        return None
+    return ''.join([open_.removesuffix(ANCHOR[0]),
+                    '<span class="self-link">', label, '</span>',
+                    close.removeprefix(ANCHOR[1])])
+
+
 class Template:
     def __init__(self, text: TextTree, title: TextTree, styles: Styles,
                  templates: TemplateStore, components: Components = None):
@@ -52,214 +127,243 @@ class Template:
         self.title = title
         self.styles = styles or templates.styles
         self.templates = templates
-        self.started = self.templates.started
-        self.hierarchy = []
-        self._level = -1
+        self._tags = self.templates.tags(self.styles)
         self.components = components or Components()
 
-    @property
-    def html(self):
-        html = ''.join([self._html(elt, self.components) for elt in self.text])
-        html += ''.join(reversed(self.hierarchy))
-        return re.sub(fr'<a href="{self.templates.page.name}\.html.*?">(.*?)</a>',
-                      r'<span class="self-link">\1</span>', html)
+    def html(self, context: Context, components: Components = None):
+        with context.template(components or self.components):
+            html = ''.join([self._html(elt, context.components, context)
+                            for elt in self.text])
+            return html + ''.join(reversed(context.hierarchy))
 
-    def _html(self, obj, components=None):
+    def _html(self, obj, components, context: Context):
         components = components or Components()
         if isinstance(obj, str):
-            return self.string(obj, components)
+            return self.string(obj, components, context)
+        return self.section(obj, components, self._tag(obj.name), context)
+
+    def _tag(self, name):
+        if self._tags is not None:
+            return self._tags[name]
         try:
-            tag = self.styles[obj.name]
+            return self.styles.select(name)
         except KeyError as e:
-            raise KeyError(f'Tag {obj.name} does not exist') from e
-        return self.section(obj, components, tag)
+            raise KeyError(f'Tag {name} does not exist') from e
 
-    def section(self, obj, components, tag):
-        composition = self.compose(obj, components, tag)
+    def section(self, obj, components, tag, context: Context):
+        composition = self.compose(obj, components, tag, context)
         new_rank = tag.hierarchy.rank
         if not new_rank:
             return composition
-        difference = new_rank - len(self.hierarchy)
-        self.hierarchy += [''] * difference
+        hierarchy = context.hierarchy
+        hierarchy += [''] * (new_rank - len(hierarchy))
         prequel = ''
-        while len(self.hierarchy) > new_rank:
-            prequel += self.hierarchy.pop()
+        while len(hierarchy) > new_rank:
+            prequel += hierarchy.pop()
         prequel += tag.hierarchy.start
-        self.hierarchy.append(tag.hierarchy.end)
+        hierarchy.append(tag.hierarchy.end)
         return ''.join([prequel, composition])
 
-    def replace_param(self, obj, components, tag):
-        # _, language_code = (utils.try_split(
-        #     obj.name, '@')) if tag.language else (None, None)
+    def replace_param(self, obj, components, tag, context: Context):
         node = Node()
-        items = [obj, components, self._html, self.templates.page]
+        html = partial(self._html, context=context)
+        items = [obj, components, html, context.page]
+        for name in page_links(tag.param):
+            context.read(name, tuple(context.page.names))
         try:
             node.add(tag.decode_param(items))
         except (IndexError, ValueError):  # usually a broken link
-            return self._html(obj.other_child, components)
+            return self._html(obj.other_child, components, context)
         except TypeError as e:
             raise TypeError(obj, tag.param) from e
-        return self.types(tag)(node, components, tag)
+        return self.types(tag)(node, components, tag, context)
 
-    def compose(self, obj, components, tag):
+    def compose(self, obj, components, tag, context: Context):
         components = components.new(tag)
         if tag.param and tag.type != 'toc':
-            return self.replace_param(obj, components, tag)
-        return self.types(tag)(obj, components, tag)
+            return self.replace_param(obj, components, tag, context)
+        return self.types(tag)(obj, components, tag, context)
 
     # pylint: disable=R0911
-    def data(self, obj: Node, components: Components, *_tag):
+    def data(self, obj: Node, components: Components, _tag, context: Context):
         match obj.first_child:
             case 'contents':
-                return self.contents(components)
+                context.read('entry', tuple(context.page.names))
+                return self.contents(components, context)
             case 'name':
-                return utils.buy_caps(self.templates.page.name)
+                return utils.buy_caps(context.page.name)
             case 'year':
+                context.read('year')
                 return str(dt.now().year)
             case 'entry-title':
-                return self.templates.entry_title
+                context.read('entry', tuple(context.page.names))
+                return context.page.title
             case 'title':
-                return ''.join([self._html(elt, self.components) for elt in self.templates.title])
+                return ''.join([self._html(elt, context.components, context)
+                                for elt in context.contents.title])
             case 'root':
-                return self.templates.page.root.name
+                return context.page.root.name
             case other:
-                return self._data(other)
+                return self._data(other, context)
 
-    def _data(self, obj: str):
+    def _data(self, obj: str, context: Context):
         function, parameter = utils.try_split(obj, '|')
         match function:
             case 'date':
-                return utils.format_date(self.templates.page.date, parameter)
+                context.read('entry', tuple(context.page.names))
+                return utils.format_date(context.page.date, parameter)
             case _other:
                 return obj
 
     def types(self, tag):
+        if self._tags is not None:
+            return tag.function(self)
         try:
             function = getattr(self, tag.type)
         except AttributeError:
             function = self.block if tag.block else self.span
         return function
 
-    def repeat(self, obj, components, _tag):
+    def repeat(self, obj, components, _tag, context: Context):
+        context.read('hierarchy')
         try:
-            return ''.join([self._repeat(entry, obj, components)
-                            for entry in self.templates.page.hierarchy])
+            return ''.join([self._repeat(entry, obj, components, context)
+                            for entry in context.page.hierarchy])
         except KeyError:
-            return ''.join([self._repeat(entry, obj, components) for entry in self.templates.page])
+            return ''.join([self._repeat(entry, obj, components, context)
+                            for entry in context.page])
 
-    def _repeat(self, entry, obj, components):
+    def _repeat(self, entry, obj, components, context: Context):
         if entry.level == 1:
             return ''
-        self.templates.page = entry
-        return ''.join([self._html(elt, components) for elt in obj])
+        context.page = entry
+        return ''.join([self._html(elt, components, context) for elt in obj])
 
-    def toc(self, obj, _components, tag):
-        self._level = -1
+    def toc(self, obj, _components, tag, context: Context):
+        current = -1
         open_tags = []
         output = ''
-        page = self.templates.page
+        page = context.page
         try:
-            family = page.reunion(obj.first_child.split('-'))
-        except ValueError:
-            family = page.root.reunion(obj.first_child.split('-'))
+            groups = obj.first_child
+            relatives = family(page, groups.split('-'))
         except IndexError:  # page is a dictionary entry
             return ''
-        for entry in self.templates.page.hierarchy:
-            if entry in family:
-                for _ in range(max(0, self._level - entry.level)):
-                    with utils.ignored(IndexError):
-                        output += open_tags.pop()
-                num = max(0, entry.level -
-                          self._level) if self._level > -1 else 1
-                for _ in range(num):
-                    if open_tags:
-                        output += tag.start + tag.open
-                        open_tags += [tag.close + tag.end]
-                    else:
-                        output += tag.open
-                        open_tags = [tag.close]
-                self._level = entry.level
-                output += tag.start or ''
-                if entry == page:
-                    output += entry.name
+        context.read('family', tuple(page.names), groups)
+        for names in relatives:
+            level = max(0, len(names) - 1)
+            for _ in range(max(0, current - level)):
+                with utils.ignored(IndexError):
+                    output += open_tags.pop()
+            num = max(0, level - current) if current > -1 else 1
+            for _ in range(num):
+                if open_tags:
+                    output += tag.start + tag.open
+                    open_tags += [tag.close + tag.end]
                 else:
-                    output += tag.param.replace('$link$', utils.link(entry)
-                                                ).replace('$name$', entry.name)
-                output += tag.end or ''
+                    output += tag.open
+                    open_tags = [tag.close]
+            current = level
+            output += tag.start or ''
+            if names == page.names:
+                output += names[-1]
+            else:
+                link = utils.link(page.new(names))
+                output += tag.param.replace('$link$', link
+                                            ).replace('$name$', names[-1])
+            output += tag.end or ''
         output += ''.join(reversed(open_tags))
         return output
 
-    def error(self, obj, components, _tag):
-        return ''.join([self._html(elt, components) for elt in obj])
+    def error(self, obj, components, _tag, context: Context):
+        return ''.join([self._html(elt, components, context) for elt in obj])
 
-    def block(self, obj: Node, components: Components, tag: Tag):
+    def block(self, obj: Node, components: Components, tag: Tag,
+              context: Context):
         end = ''
-        text = ''.join([self._html(elt, components) for elt in obj])
-        if self.started:
-            end = self.started.tag  # + '!block!'
-            self.started.update()
+        text = ''.join([self._html(elt, components, context) for elt in obj])
+        if (started := context.started):
+            end = started.tag  # + '!block!'
+            started.update()
         return f'{tag.open}{text}{end}{tag.close}'
 
-    def span(self, obj: Node, components: Components, tag: Tag):
+    def span(self, obj: Node, components: Components, tag: Tag,
+             context: Context):
         start = ''
-        if not self.started:
+        if not (started := context.started):
             start = components.start or ''  # + '!span!'
-            self.started.update(components.end or '')
-        text = ''.join([self._html(elt, components) for elt in obj])
-        return f'{start}{tag.open}{text}{tag.close}'
+            started.update(components.end or '')
+        text = ''.join([self._html(elt, components, context) for elt in obj])
+        open_, close = tag.open, tag.close
+        if text.startswith(href := context.href):
+            if (link := self_link(open_, text, close, href)) is not None:
+                return f'{start}{link}'
+        return f'{start}{open_}{text}{close}'
 
-    def template(self, obj: Node, components: Components, *_args):
+    def template(self, obj: Node, components: Components, _tag,
+                 context: Context):
         name = obj.first_child.lower().replace(' ', '')
         try:
-            template = self.templates[name]
+            template = (context.contents if name == 'main'
+                        else self.templates[name])
         except KeyError:
             return ''
-        template.components = components
+        fragments = self.templates.fragments
+        key = fragments.key(name, components, context)
+        with utils.ignored(KeyError):
+            return fragments.get(key, context)
+        outer, context.reads = context.reads, set()
         try:
-            if name == 'mini-nav':
-                pass # break
-            return template.html
+            html = template.html(context, components)
         except KeyError as e:
             raise KeyError(f'Template {name} is missing a tag') from e
+        finally:
+            reads, context.reads = context.reads, outer
+            outer |= reads
+        fragments.add(key, html, context, reads)
+        return html
 
-    def heading(self, obj: Node, components: Components, tag: Tag):
-        level = components.wholepage and self.templates.page.level
+    def heading(self, obj: Node, components: Components, tag: Tag,
+                context: Context):
+        level = components.wholepage and context.page.level
         tag = tag.incremented_copy(level)
-        return self.block(obj, components, tag)
+        return self.block(obj, components, tag, context)
 
-    def table(self, obj: Node, components: Components, tag: Tag):
+    def table(self, obj: Node, components: Components, tag: Tag,
+              context: Context):
         end = ''
         components = Components('<tr>|', '|', '|</tr>', components.wholepage)
-        text = ''.join([self._html(elt, components) for elt in obj])
-        if self.started:
-            end = self.started.tag  # + '!table!'
-            self.started.update()
+        text = ''.join([self._html(elt, components, context) for elt in obj])
+        if (started := context.started):
+            end = started.tag  # + '!table!'
+            started.update()
         text = cells(text + end)
         return f'{tag.open}{text}{tag.close}'
 
-    def contents(self, components: Components):
-        text = self.templates.page.text
-        title = self.templates.page.title
+    def contents(self, components: Components, context: Context):
+        page = context.page
+        text = page.stream() if self.templates.streaming else page.text
+        title = page.title
         styles = self.templates.styles
         template = type(self)(text, title, styles, self.templates, components)
         try:
-            return template.html
+            return template.html(context)
         except KeyError as e:
             raise KeyError(f'Unable to generate html from entry <{
-                           self.templates.page.name}>') from e
+                           context.page.name}>') from e
 
     def link(self, obj: Node, *_args):
         return utils.link(obj.first_child.split('/'))
 
-    def string(self, text: str, components: Components):
+    def string(self, text: str, components: Components, context: Context):
         start = end = para = ''
-        if not self.started:
+        if not (started := context.started):
             start = components.start or ''  # + '!string!'
-            self.started.update(components.end)
+            started.update(components.end)
         text = text.replace('|', components.pipe)
-        if text.endswith('\n') and self.started:
-            end = self.started.tag  # + '!string!'
-            self.started.update()
+        if text.endswith('\n') and started:
+            end = started.tag  # + '!string!'
+            started.update()
             text, para = text.removesuffix('\n'), '\n'
         if start and end and not text:
             return para
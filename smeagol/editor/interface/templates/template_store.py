@@ -1,40 +1,28 @@
-from dataclasses import dataclass
-
-from smeagol.conversion.text_tree.text_tree import TextTree
+from smeagol.conversion.text_tree import tree_cache
 from smeagol.editor.interface.assets.templates import Templates
-from smeagol.editor.interface.templates.template import Template
+from smeagol.editor.interface.templates.compiler import (CompiledStyles,
+                                                         compile_tree)
+from smeagol.editor.interface.templates.fragments import Fragments
+from smeagol.editor.interface.templates.template import Context, Template
 from smeagol.utilities import filesystem as fs
-from smeagol.utilities import utils
-from smeagol.utilities.types import Entry
 from smeagol.widgets.styles.styles import Styles
 
 
-@dataclass
-class Contents:
-    page: Template = None
-    contents: Entry = None
-
-    def update(self, page=None, contents=None):
-        if page:
-            self.page = page
-        if contents:
-            self.contents = contents
-
-
 class TemplateStore:
-    def __init__(self, templates: Templates = None, styles=None):
-        self.started = utils.Flag()
+    def __init__(self, templates: Templates = None, styles=None,
+                 streaming=False, compiled=True):
         self.styles = styles
-        self._contents = Contents()
+        self.streaming = streaming
+        self.compiled = {} if compiled else None
+        self.fragments = Fragments(self)
         self._filenames = templates or Templates()
         self._cache = {'sections': {}, 'special': {}}
 
     def special_files(self, site):
         for item in self._filenames.special:
-            contents = self._get_from('special', item)
-            self._contents.update(site, contents)
+            context = Context(site, self._get_from('special', item), site)
             try:
-                yield item, self.main.html
+                yield item, self.main.html(context)
             except KeyError as e:
                 raise KeyError(f'Unable to save {item}') from e
 
@@ -42,14 +30,6 @@ class TemplateStore:
         match attr:
             case 'main' | 'entry':
                 return self._cached(attr)
-            case 'page':
-                return self._contents.page
-            case 'contents':
-                return self._contents.contents
-            case 'entry_title':
-                return self._contents.page.title
-            case 'title':
-                return self._contents.contents.title
             case 'sections' | 'special':
                 return self._cache[attr]
             case _default:
@@ -60,14 +40,6 @@ class TemplateStore:
                     raise AttributeError(
                         f"'{name}' object has no attribute '{attr}'") from e
 
-    def __setattr__(self, attr, value):
-        match attr:
-            case 'page':
-                self._contents.update(page=value)
-            case _default:
-                super().__setattr__(attr, value)
-
-
     def _cached(self, attr):
         try:
             return self._cache[attr]
@@ -80,14 +52,24 @@ class TemplateStore:
         if not template:
             raise IOError(f'{filename} not found')
         styles = Styles(template.get('styles', {}), links=self.styles.links)
-        text = TextTree(template.get('text', []), styles.ranks)
-        title = TextTree(template.get('title', []), styles.ranks)
+        text = tree_cache.parse(template.get('text', []), styles.ranks)
+        title = tree_cache.parse(template.get('title', []), styles.ranks)
         self._filenames.update(template.get('templates', {}))
+        if (tags := self.tags(styles)) is not None:
+            compile_tree(text, tags)
+            compile_tree(title, tags)
         return Template(text, title, styles, self)
 
+    def tags(self, styles):
+        '''Compiled tags for styles, or None to interpret them afresh'''
+        if self.compiled is None:
+            return None
+        try:
+            return self.compiled[styles]
+        except KeyError:
+            return self.compiled.setdefault(styles, CompiledStyles(styles))
+
     def __getitem__(self, key):
-        if key == 'main':
-            return self._contents.contents
         return self._get_from('sections', key)
 
     def __setitem__(self, key, value):
@@ -100,12 +82,14 @@ class TemplateStore:
             template = self._load(getattr(self._filenames, name)[item])
             return self._cache[name].setdefault(item, template)
 
-    def update(self, page):
-        self._contents.update(page)
-
-    def html(self, entry):
-        self._contents.update(entry, self.entry)
-        return self.main.html
+    def html(self, entry, reads: set = None):
+        '''entry's page, adding what it read besides templates to reads'''
+        context = Context(entry, self.entry, entry)
+        context.read('entry', tuple(entry.names))
+        html = self.main.html(context)
+        if reads is not None:
+            reads |= context.reads
+        return html
 
     @property
     def items(self):
@@ -1,17 +1,18 @@
 from typing import Optional, Self
 
+from smeagol.site.family import append_child, get_index, pop_child
 from smeagol.utilities import utils
 
 
-def get_name(obj):
-    return obj if isinstance(obj, str) else obj[0]
+class Indices:
+    '''
+    Lookups over one directory tree, shared by every Directory made on
+    it, so that each is built once and goes when the tree does.
+    '''
 
-
-def get_index(obj, name):
-    for i, elt in enumerate(obj):
-        if elt[0] == name:
-            return i
-    raise ValueError(f'{get_name(obj)} has no item {name}')
+    def __init__(self):
+        self.children = {}  # id(node) -> (node, length, name -> index)
+        self.navigation = None  # see navigation.index
 
 
 class Directory:
@@ -20,12 +21,16 @@ class Directory:
                  subdirectory: bool = False):
         self.names = names or ['']
         self.directory = directory or [self.names[0]]
+        self.indices = Indices()
         with utils.ignored(AttributeError):
+            self.indices = self.directory.indices
             self.directory = self.directory.directory
         if subdirectory:
             self.names.append(self.name)
 
     def __iter__(self):
+        with utils.ignored(AttributeError):
+            return self.directory.paths()  # directory is a tree_store.Branch
         return self._rec(self.directory)
 
     def _rec(self, obj, names=None):
@@ -44,7 +49,7 @@ class Directory:
 
     def new(self, names=None):
         names = names or self.names
-        return type(self)(self.directory, names)
+        return type(self)(self, names)
 
     def subdirectory(self, obj=None, names=None):
         return type(self)(directory=obj, names=names, subdirectory=True)
@@ -53,7 +58,7 @@ class Directory:
         location = []
         obj = self.directory
         for name in names[1:]:
-            index = get_index(obj, name)
+            index = get_index(obj, name, self.indices.children)
             location.append(index)
             obj = obj[index]
         return location
@@ -62,22 +67,21 @@ class Directory:
         obj = self.directory
         for name in names[1:]:
             try:
-                index = get_index(obj, name)
+                index = get_index(obj, name, self.indices.children)
             except ValueError:
-                obj.append([name])
-                index = len(obj) - 1
+                index = append_child(obj, name, self.indices.children)
             obj = obj[index]
 
     def remove(self, names):
         obj = self.directory
         name = names.pop()
         for entry in names[1:]:
-            index = get_index(obj, entry)
+            index = get_index(obj, entry, self.indices.children)
             obj = obj[index]
-        index = get_index(obj, name)
+        index = get_index(obj, name, self.indices.children)
         if len(obj[index]) != 1:
             raise IndexError(f'Unable to remove non-empty subdirectory {name}')
-        obj.pop(get_index(obj, name))
+        pop_child(obj, index, self.indices.children)
 
     def pprint(self) -> None:
         self._pprint(self.directory)
@@ -1,4 +1,5 @@
 from typing import Self, Optional
+from smeagol.site import shards
 from smeagol.utilities import utils
 
 
@@ -7,6 +8,7 @@ class Entries:
         self.entries = entries
         with utils.ignored(AttributeError):
             self.entries = self.entries.entries
+        shards.load(self.entries)
 
     def pop(self, attr):
         self.entries.pop(attr, None)
@@ -21,14 +23,37 @@ class Entries:
                 yield ([*names, name])
                 yield from self._rec(elt, (*names, name))
 
-    def add(self, names: list[str]):
+    def items(self):
+        '''(names, data) for every entry, without wrapping either'''
+        stack = [((), iter(self.children.items()))]
+        while stack:
+            names, children = stack[-1]
+            for name, item in children:
+                path = (*names, name)
+                yield path, shards.load(item)
+                try:
+                    grandchildren = item.get('children')
+                except AttributeError:
+                    continue
+                if grandchildren:
+                    stack.append((path, iter(grandchildren.items())))
+                    break
+            else:
+                stack.pop()
+
+    def add(self, names: list[str]) -> int:
         obj: dict = self.entries
+        added = 0
         for name in names:
-            obj = obj.setdefault('children', {}).setdefault(name, {})
+            children = obj.setdefault('children', {})
+            added += name not in children
+            obj = children.setdefault(name, {})
+        return added
 
     def remove(self, names: list[str]):
         name = names.pop()
         parent = self[names].entries['children']
+        shards.load(parent[name])
         if parent[name].get('children') or parent[name].get('text'):
             raise IndexError(f'Unable to remove non-empty entry {name}')
         parent.pop(name, None)
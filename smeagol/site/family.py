@@ -4,24 +4,67 @@ spit back its family as lists of strings. This list of strings can
 then be fed into Nodes to get them as Node/Entry/Page.
 '''
 
+from smeagol.utilities import utils
+
 
 def get_name(obj):
     return obj if isinstance(obj, str) else obj[0]
 
 
-def get_index(obj, name):
-    for i, elt in enumerate(obj):
-        if elt[0] == name:
-            return i
-    raise ValueError(f'{get_name(obj)} has no item {name}')
+def child_indices(obj, indices: dict = None) -> dict[str, int]:
+    '''
+    Map each child's name to its index in obj. A tree_store.Branch keeps
+    its own maps. Otherwise they are kept in indices, which belongs to
+    the Directory that owns the tree, and rebuilt if obj's length changes.
+    '''
+    if not isinstance(obj, list):
+        return obj.child_indices()  # obj is a tree_store.Branch
+    if indices is not None:
+        node, length, names = indices.get(id(obj), (None, 0, None))
+        if node is obj and length == len(obj):
+            return names
+    names = {}
+    for i, elt in enumerate(obj[1:], start=1):
+        names.setdefault(get_name(elt), i)
+    if indices is not None:
+        indices[id(obj)] = (obj, len(obj), names)
+    return names
+
+
+def get_index(obj, name, indices: dict = None):
+    try:
+        index = child_indices(obj, indices)[name]
+    except KeyError as e:
+        raise ValueError(f'{get_name(obj)} has no item {name}') from e
+    if get_name(obj[index]) != name and indices is not None:
+        del indices[id(obj)]  # obj was reordered behind our back
+        return get_index(obj, name, indices)
+    return index
+
+
+def append_child(obj, name, indices: dict = None):
+    obj.append([name])
+    index = len(obj) - 1
+    with utils.ignored(KeyError, TypeError):
+        node, _length, names = indices[id(obj)]
+        if node is obj:
+            names.setdefault(name, index)
+            indices[id(obj)] = (obj, len(obj), names)
+    return index
+
+
+def pop_child(obj, index, indices: dict = None):
+    with utils.ignored(KeyError, TypeError):
+        del indices[id(obj)]
+    return obj.pop(index)
 
 
-def recurse(obj, names):
+def recurse(obj, names, indices: dict = None):
     names = names[1:]
     if not names:
         return obj
-    index = get_index(obj, names[0])
-    return recurse(obj[index], names)
+    index = get_index(obj, names[0], indices)
+    return recurse(obj[index], names, indices)
 
 
 def generator(obj, names):
@@ -40,36 +83,37 @@ def lineage(names):
         names.pop()
 
 
-def children(directory, names) -> list[str]:
-    obj = recurse(directory, names)
+def children(directory, names, indices: dict = None) -> list[str]:
+    obj = recurse(directory, names, indices)
     yield from generator(obj, names)
 
 
-def generation(directory: list[list[str]], names: list[str], number: int):
+def generation(directory: list[list[str]], names: list[str], number: int,
+               indices: dict = None):
     if not number:
         yield [names[0]]
         return
     if number > len(names):
         raise IndexError(f'Entry has no generation {number}')
-    obj = recurse(directory, names[:number])
+    obj = recurse(directory, names[:number], indices)
     yield from generator(obj, names[:number])
 
 
-def siblings(directory, names):
+def siblings(directory, names, indices: dict = None):
     names = parent(names)
     if not names:
         return
-    obj = recurse(directory, names)
+    obj = recurse(directory, names, indices)
     yield from generator(obj, names)
 
 
-def aunts(directory, names):
+def aunts(directory, names, indices: dict = None):
     for ancestor in lineage(names):
-        yield from siblings(directory, ancestor)
+        yield from siblings(directory, ancestor, indices)
 
 
-def descendants(directory, names):
-    obj = recurse(directory, names)
+def descendants(directory, names, indices: dict = None):
+    obj = recurse(directory, names, indices)
     for elt in obj[1:]:
         yield from _rec(elt, names)
 
@@ -81,35 +125,36 @@ def _rec(obj, names=None):
         yield from _rec(elt, names)
 
 
-def next_entry(directory, names, already: bool = False):
+def next_entry(directory, names, already: bool = False,
+               indices: dict = None):
     if already:
-        return _next_entry(directory, names)
-    obj = recurse(directory, names)
+        return _next_entry(directory, names, indices)
+    obj = recurse(directory, names, indices)
     try:
         return [*names, get_name(obj[1])]
     except IndexError:  # has no children
-        return sibling(directory, names)
+        return sibling(directory, names, indices)
 
 
-def sibling(directory, names):
+def sibling(directory, names, indices: dict = None):
     try:
-        return _next_entry(directory, names)
+        return _next_entry(directory, names, indices)
     except ValueError as e:
         raise IndexError('No more nodes!') from e
 
 
-def _next_entry(directory, names):
+def _next_entry(directory, names, indices: dict = None):
     try:
-        return next_sister(directory, names)
+        return next_sister(directory, names, indices)
     except IndexError:
-        return next_entry(directory, names, True)
+        return next_entry(directory, names, True, indices)
 
 
-def sister(directory, names, offset):
+def sister(directory, names, offset, indices: dict = None):
     name = names.pop()
-    obj = recurse(directory, names)
+    obj = recurse(directory, names, indices)
     try:
-        index = get_index(obj, name) + offset
+        index = get_index(obj, name, indices) + offset
     except ValueError:
         index = offset
     if 0 < index < len(obj):
@@ -117,19 +162,19 @@ def sister(directory, names, offset):
     raise IndexError(f'No such sister {index}')
 
 
-def next_sister(directory, names):
-    return sister(directory, names, +1)
+def next_sister(directory, names, indices: dict = None):
+    return sister(directory, names, +1, indices)
 
 
-def previous_sister(directory, names):
-    return sister(directory, names, -1)
+def previous_sister(directory, names, indices: dict = None):
+    return sister(directory, names, -1, indices)
 
 
-def previous_entry(directory, names):
+def previous_entry(directory, names, indices: dict = None):
     name = names.pop()
-    obj = recurse(directory, names)
+    obj = recurse(directory, names, indices)
     try:
-        index = get_index(obj, name) - 1
+        index = get_index(obj, name, indices) - 1
     except ValueError as e:
         raise IndexError('No more nodes') from e
     if index:
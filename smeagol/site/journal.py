@@ -0,0 +1,101 @@
+'''
+An append-only log of entry edits, kept beside the source file.
+
+Every record is one line of JSON, synced to disk before the save returns.
+A line that was cut short by a crash is dropped when the journal is next
+read, and replaying a record that has already reached the source changes
+nothing, so the journal may safely outlive a compaction.
+'''
+
+import json
+import os
+
+from smeagol.utilities import utils
+
+SUFFIX = '.journal'
+
+
+class Journal:
+    def __init__(self, source: str, limit: int = 1 << 20):
+        self.filename = f'{source}{SUFFIX}'
+        self.limit = limit
+
+    @property
+    def size(self) -> int:
+        try:
+            return os.path.getsize(self.filename)
+        except OSError:
+            return 0
+
+    @property
+    def full(self) -> bool:
+        return self.size >= self.limit
+
+    def set(self, names: list[str], data: dict):
+        data = {k: v for k, v in data.items() if k != 'children'}
+        self._append({'set': names, 'data': data})
+
+    def add(self, names: list[str]):
+        self._append({'add': names})
+
+    def remove(self, names: list[str]):
+        self._append({'remove': names})
+
+    def _append(self, record):
+        line = json.dumps(record, ensure_ascii=False, default=str) + '\n'
+        with open(self.filename, 'a', encoding='utf-8') as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def records(self):
+        try:
+            with open(self.filename, 'rb') as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return
+        good = 0
+        for line in lines:
+            try:
+                if not line.endswith(b'\n'):
+                    raise ValueError('incomplete record')
+                record = json.loads(line)
+            except ValueError:
+                self._truncate(good)
+                return
+            good += len(line)
+            yield record
+
+    def _truncate(self, size):
+        with open(self.filename, 'r+b') as f:
+            f.truncate(size)
+
+    def clear(self):
+        with utils.ignored(FileNotFoundError):
+            os.remove(self.filename)
+
+
+def replay(site, records) -> int:
+    '''Apply journal records to site, and return the number applied'''
+    count = 0
+    for count, record in enumerate(records, start=1):
+        match record:
+            case {'set': names, 'data': data}:
+                _set(site, names, data)
+            case {'add': names}:
+                site.add_entry(site.new(names))
+            case {'remove': names}:
+                with utils.ignored(IndexError, KeyError, ValueError):
+                    site.remove_entry(site.new(names))
+    site.registry.clear()
+    return count
+
+
+def _set(site, names, data):
+    site.add_entry(site.new(names))
+    entry = site.entries[names].entries
+    children = entry.pop('children', None)
+    entry.clear()
+    entry.update(data)
+    if children is not None:
+        entry['children'] = children
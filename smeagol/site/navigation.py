@@ -0,0 +1,202 @@
+'''
+A preorder index over a site's directory, built once per directory.
+
+Every node is numbered in preorder, so its subtree is the interval
+[position, position + size). Next and previous pages skip level-1
+nodes, as Relation always has, and are kept per node so that each is a
+single lookup.
+
+Site.add_entry and Site.remove_entry splice nodes in and out. An edit
+changes the sizes of the node's ancestors, and the next and previous
+pages of only those nodes between it and the pages either side of it.
+Positions after the edit are renumbered when next looked up, in one
+pass however many edits came before.
+'''
+
+from smeagol.site.directory import Directory
+
+
+def skip(names):
+    return len(names) == 2
+
+
+def _page(run):
+    return run[-1] if run and not skip(run[-1]) else None
+
+
+class Navigation:
+    def __init__(self, directory=None):
+        self.order = [tuple(names) for names in Directory(directory)]
+        self.size = self._sizes()
+        self.positions = {}
+        self.stale = 0  # positions from here on may be out of date
+        self._renumber()
+        self._paginate()
+
+    def _sizes(self):
+        sizes = [0] * len(self.order)
+        stack = []
+        for position, names in enumerate(self.order):
+            while stack and len(self.order[stack[-1]]) >= len(names):
+                start = stack.pop()
+                sizes[start] = position - start
+            stack.append(position)
+        for start in stack:
+            sizes[start] = len(self.order) - start
+        return sizes
+
+    def _renumber(self):
+        for position in range(self.stale, len(self.order)):
+            self.positions[self.order[position]] = position
+        self.stale = len(self.order)
+
+    def _paginate(self):
+        self.next, self.previous = {}, {}
+        page = None
+        for names in self.order:
+            self.previous[names] = page
+            if not skip(names):
+                page = names
+        page = None
+        for names in reversed(self.order):
+            self.next[names] = page
+            if not skip(names):
+                page = names
+
+    def position(self, names) -> int:
+        names = tuple(names)
+        try:
+            position = self.positions[names]
+        except KeyError as e:
+            raise ValueError(f'{names[-1]} is not in the directory') from e
+        if position >= self.stale:
+            self._renumber()
+            position = self.positions[names]
+        return position
+
+    def end(self, position: int) -> int:
+        return position + self.size[position]
+
+    def _ancestors(self, names):
+        return [self.position(names[:i]) for i in range(1, len(names))]
+
+    def add(self, names: list[str]):
+        for i in range(2, len(names) + 1):
+            if tuple(names[:i]) not in self.positions:
+                self._insert(tuple(names[:i]))
+
+    def _insert(self, names):
+        ancestors = self._ancestors(names)
+        position = self.end(ancestors[-1])
+        for ancestor in ancestors:
+            self.size[ancestor] += 1
+        self.order.insert(position, names)
+        self.size.insert(position, 1)
+        self.positions[names] = position
+        self.stale = min(self.stale, position)
+        before, after = self._run(position, -1), self._run(position, +1)
+        self.previous[names], self.next[names] = _page(before), _page(after)
+        if not skip(names):
+            self._point(before, after, names, names)
+
+    def remove(self, names: list[str]):
+        position = self.position(names)
+        if self.size[position] != 1:
+            raise IndexError(f'Unable to remove non-empty node {names[-1]}')
+        for ancestor in self._ancestors(names):
+            self.size[ancestor] -= 1
+        names = self.order[position]
+        if not skip(names):
+            before, after = self._run(position, -1), self._run(position, +1)
+            self._point(before, after, self.next[names], self.previous[names])
+        del self.order[position], self.size[position]
+        del self.positions[names], self.next[names], self.previous[names]
+        self.stale = min(self.stale, position)
+
+    def _run(self, position, step):
+        '''The nodes beside position, in direction step, up to a page'''
+        run = []
+        position += step
+        while 0 <= position < len(self.order):
+            run.append(names := self.order[position])
+            if not skip(names):
+                break
+            position += step
+        return run
+
+    def _point(self, before, after, following, previous):
+        for names in before:
+            self.next[names] = following
+        for names in after:
+            self.previous[names] = previous
+
+    def next_page(self, names) -> list[str]:
+        return self._page(self.next, names)
+
+    def previous_page(self, names) -> list[str]:
+        return self._page(self.previous, names)
+
+    def _page(self, pages, names):
+        try:
+            page = pages[tuple(names)]
+        except KeyError as e:
+            raise ValueError(f'{names[-1]} is not in the directory') from e
+        if page is None:
+            raise IndexError('No more nodes!')
+        return list(page)
+
+    def children(self, names):
+        position = self.position(names)
+        child = position + 1
+        while child < self.end(position):
+            yield list(self.order[child])
+            child = self.end(child)
+
+    def siblings(self, names):
+        if len(names) > 1:
+            yield from self.children(names[:-1])
+
+    def descendants(self, names):
+        position = self.position(names)
+        for descendant in range(position + 1, self.end(position)):
+            yield list(self.order[descendant])
+
+    def aunts(self, names):
+        names = list(names)
+        while len(names) > 1:
+            yield from self.siblings(names)
+            names.pop()
+
+    def ordered(self, family) -> list[list[str]]:
+        '''family in preorder, each once, leaving out any not in the directory'''
+        self._renumber()
+        positions = {self.positions.get(tuple(names)) for names in family}
+        positions.discard(None)
+        return [list(self.order[position]) for position in sorted(positions)]
+
+    def contains(self, ancestor: int, position: int) -> bool:
+        return ancestor < position < self.end(ancestor)
+
+    def is_descendant(self, names, other) -> bool:
+        '''names is a descendant of other'''
+        return self.contains(self.position(other), self.position(names))
+
+    def is_sibling(self, names, other) -> bool:
+        '''names and other share a parent'''
+        if len(names) < 2 or len(other) < 2:
+            return False
+        return self.position(names[:-1]) == self.position(other[:-1])
+
+    def is_aunt(self, names, other) -> bool:
+        '''names is a sibling of other or of one of other's ancestors'''
+        if len(names) < 2:
+            return False
+        return self.contains(self.position(names[:-1]), self.position(other))
+
+
+def index(directory: Directory) -> Navigation:
+    '''The Navigation kept with directory's tree, built on first use'''
+    indices = directory.indices
+    if indices.navigation is None:
+        indices.navigation = Navigation(directory)
+    return indices.navigation
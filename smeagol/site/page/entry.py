@@ -2,6 +2,7 @@ from datetime import datetime as dt
 
 from smeagol.utilities import utils
 from smeagol.site.page.relation import Relation
+from smeagol.conversion.text_tree import stream, tree_cache
 from smeagol.conversion.text_tree.text_tree import TextTree
 
 
@@ -47,7 +48,7 @@ class Entry(Relation):
     @property
     def text(self):
         if not self._texttree:
-            self._texttree = TextTree(self._text)
+            self._texttree = tree_cache.parse(self._text)
         return self._texttree
 
     @text.setter
@@ -56,6 +57,11 @@ class Entry(Relation):
         with utils.ignored(AttributeError):
             text = [line for line in text.splitlines() if line]
         self.data['text'] = text
+        self.registry.add(self)  # replaces any copy holding the old tree
+
+    def stream(self):
+        '''The entry's top-level nodes, each parsed only when it is reached'''
+        return stream.nodes(self._text)
 
     def _texts(self, value):
         if isinstance(value, TextTree):
@@ -2,26 +2,32 @@ from typing import Self
 
 from smeagol.site.directory import Directory
 from smeagol.site.entries import Entries
+from smeagol.site.page.registry import Registry
 from smeagol.utilities.utils import ignored
 
 
 class Node:
-    def __init__(self, directory=None, entries=None, names=None):
+    def __init__(self, directory=None, entries=None, names=None,
+                 registry: Registry = None):
         self.directory = Directory(directory, names)
         self.entries = Entries(entries)
         self.names = names or [self.directory.name or self.entries.name]
+        self.registry = Registry() if registry is None else registry
         self._data = None
+        self._location = None
 
     @property
     def location(self) -> list[int]:
-        return self.directory.location(self.names)
+        if self._location is None:
+            self._location = self.directory.location(self.names)
+        return self._location
 
     def _find(self, location: list[int]) -> Self:
         obj = self.directory
         names = [obj.name]
         for place in location:
             names.append(self._locate(obj, place))
-        return type(self)(self.directory, self.entries, names)
+        return self.registry.get(names, self._new)
 
     def _locate(self, obj: Directory, place: int):
         try:
@@ -57,7 +63,10 @@ class Node:
         values = values or [self.entries.name]
         with ignored(TypeError):
             values = self.directory[values].names  # values are integers
-        return type(self)(self.directory, self.entries, values[:])
+        return self.registry.get(values, self._new)
+
+    def _new(self, names: list[str]) -> Self:
+        return type(self)(self.directory, self.entries, names[:], self.registry)
 
     def __getitem__(self, values: list[str] | list[int]):
         return self.new(values)
@@ -5,6 +5,27 @@ from smeagol.site.page.entry import Entry
 from smeagol.utilities import utils
 
 
+PUNCTUATION = r'[#*‘“”"_= ….,?!:;+。$()/[\]\xa0\|\u200a-]'
+
+
+def make_link(names: list[str], leaf: bool = True) -> list[str]:
+    names = [utils.url_form(name) for name in names[1:]]
+    return names if leaf else names + ['index']
+
+
+def make_url(names: list[str], leaf: bool = True) -> str:
+    return os.path.join(*make_link(names, leaf)) + '.html'
+
+
+def find_terms(lines: list[str]) -> dict[str, set[int]]:
+    terms = {}
+    for number, line in enumerate(lines):
+        for term in re.split(PUNCTUATION, line.lower()):
+            if term:
+                terms.setdefault(term, set()).add(number)
+    return terms
+
+
 class Page(Entry):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -33,31 +54,26 @@ class Page(Entry):
         return self.text.stringify()
 
     @property
-    def link(self):
-        names = [name.lower().replace(' ', '') for name in self.names[1:]]
+    def _leaf(self):
         with utils.ignored(KeyError):
-            if not self.is_leaf:
-                names += ['index']
-        return names
+            return self.is_leaf
+        return True
+
+    @property
+    def link(self):
+        return make_link(self.names, self._leaf)
 
     @property
     def url(self):
-        return os.path.join(*self.link) + '.html'
+        return make_url(self.names, self._leaf)
 
     @property
     def name(self):
         return self.names[-1]
 
     def analysis(self):
-        punctuation = r'[#*‘“”"_= ….,?!:;+。$()/[\]\xa0\|\u200a-]'
-        self.terms.clear()
-        for number, line in enumerate(self.sentences):
-            self.lines.append(line)
-            for term in re.split(punctuation, line.lower()):
-                self._add_term(term, number)
+        for obj in self._analysis.values():
+            obj.clear()
+        self.lines.extend(self.sentences)
+        self.terms.update(find_terms(self.lines))
         return self._analysis
-
-    def _add_term(self, term, number):
-        if not term:
-            return
-        self.terms.setdefault(term, set()).add(number)
@@ -0,0 +1,35 @@
+from collections import OrderedDict
+from typing import Callable
+
+
+class Registry:
+    '''
+    Least-recently-used store of pages keyed by their names, so that
+    repeated lookups of an entry share one Page and its parsed text.
+    '''
+
+    def __init__(self, size: int = 1000):
+        self.size = size
+        self._pages = OrderedDict()
+
+    def __len__(self):
+        return len(self._pages)
+
+    def get(self, names: list[str], create: Callable):
+        key = tuple(names)
+        try:
+            self._pages.move_to_end(key)
+            return self._pages[key]
+        except KeyError:
+            return self.add(create(names))
+
+    def add(self, page):
+        if self.size:
+            self._pages[tuple(page.names)] = page
+            self._pages.move_to_end(tuple(page.names))
+            while len(self._pages) > self.size:
+                self._pages.popitem(last=False)
+        return page
+
+    def clear(self):
+        self._pages.clear()
@@ -1,29 +1,24 @@
 from smeagol.site.page.node import Node
-from smeagol.site import family
-from smeagol.utilities import utils
-
-
-def skip(names):
-    return len(names) == 2
+from smeagol.site import family, navigation
+from smeagol.site.navigation import skip
 
 
 class Relation(Node):
     # @property
     def _directory(self, names=None):
         names = names or self.names
-        return [self.directory.directory, names.copy()]
+        return [self.directory.directory, names.copy(),
+                self.directory.indices.children]
+
+    @property
+    def navigation(self):
+        return navigation.index(self.directory)
 
     def next_page(self):
-        node = family.next_entry(*self._directory())
-        while skip(node):
-            node = family.next_entry(*self._directory(node))
-        return self.new(node)
+        return self.new(self.navigation.next_page(self.names))
 
     def previous_page(self):
-        node = family.previous_entry(*self._directory())
-        while skip(node):
-            node = family.previous_entry(*self._directory(node))
-        return self.new(node)
+        return self.new(self.navigation.previous_page(self.names))
 
     def next_sister(self):
         return self.new(family.next_sister(*self._directory()))
@@ -32,51 +27,70 @@ class Relation(Node):
         return self.new(family.previous_sister(*self._directory()))
 
     def reunion(self, groups):
-        k = set()
+        return {self.new(names) for names in self.relatives(groups)}
+
+    def relatives(self, groups):
+        '''Names of everyone in groups, without making their pages'''
         for group in groups:
-            k.update(set(self.groups[group]()))
-        return k
+            yield from self.families[group]()
 
     def matriarchs(self):
-        with utils.ignored(IndexError):
-            for matriarch in family.generation(*self._directory(), 2):
-                yield self.new(matriarch)
+        yield from map(self.new, self._matriarchs())
 
     def siblings(self):
-        for sibling in family.siblings(*self._directory()):
-            if not skip(sibling):
-                yield self.new(sibling)
+        yield from map(self.new, self._siblings())
 
     def descendants(self):
-        for descendant in family.descendants(*self._directory()):
-            if not skip(descendant):
-                yield self.new(descendant)
+        yield from map(self.new, self._descendants())
 
     def children(self):
-        for child in family.children(*self._directory()):
+        yield from map(self.new, self._children())
+
+    def lineage(self):
+        yield from map(self.new, self._lineage())
+
+    def aunts(self):
+        yield from map(self.new, self._aunts())
+
+    def heirs(self):
+        yield from map(self.new, self._heirs())
+
+    def _matriarchs(self):
+        if len(self.names) < 2:
+            return
+        yield from self.navigation.children(self.names[:2])
+
+    def _siblings(self):
+        for sibling in self.navigation.siblings(self.names):
+            if not skip(sibling):
+                yield sibling
+
+    def _descendants(self):
+        for descendant in self.navigation.descendants(self.names):
+            if not skip(descendant):
+                yield descendant
+
+    def _children(self):
+        for child in self.navigation.children(self.names):
             if skip(child):
-                yield from self._skipchildren(child)
+                yield from self.navigation.children(child)
                 return
-            yield self.new(child)
-
-    def _skipchildren(self, relative):
-        for child in family.children(*self._directory(relative)):
-            yield self.new(child)
+            yield child
 
-    def lineage(self):
+    def _lineage(self):
         for ancestor in family.lineage(self.names):
             if not skip(ancestor):
-                yield self.new(ancestor)
+                yield ancestor.copy()
 
-    def aunts(self):
-        for aunt in family.aunts(*self._directory()):
+    def _aunts(self):
+        for aunt in self.navigation.aunts(self.names):
             if not skip(aunt):
-                yield self.new(aunt)
+                yield aunt
 
-    def heirs(self):
-        for heir in family.descendants(*self._directory()):
+    def _heirs(self):
+        for heir in self.navigation.descendants(self.names):
             if len(heir) <= 4 and not skip(heir):
-                yield self.new(heir)
+                yield heir
 
     @property
     def groups(self):
@@ -89,3 +103,15 @@ class Relation(Node):
             'heirs': self.heirs,
             'aunts': self.aunts
         }
+
+    @property
+    def families(self):
+        return {
+            'matriarchs': self._matriarchs,
+            'siblings': self._siblings,
+            'descendants': self._descendants,
+            'children': self._children,
+            'lineage': self._lineage,
+            'heirs': self._heirs,
+            'aunts': self._aunts
+        }
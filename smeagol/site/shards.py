@@ -0,0 +1,126 @@
+'''
+A sharded alternative to the single-file .src source.
+
+A sharded source is a folder holding a small index of the hierarchy,
+plus one JSON file per entry with everything but its children. An
+entry's file is only read the first time its data is touched, and only
+entries that have been read are written back on save.
+'''
+
+import hashlib
+import json
+import os
+
+from smeagol.utilities import filesystem as fs
+
+INDEX = 'index.json'
+SHARDS = 'entries'
+SHARD = 'shard'
+
+
+class Shard:
+    __slots__ = ('folder', 'key')
+
+    def __init__(self, folder: str, key: str):
+        self.folder = folder
+        self.key = key
+
+    def load(self) -> dict:
+        return fs.load_json(filename(self.folder, self.key))
+
+
+def filename(folder: str, key: str) -> str:
+    name = hashlib.sha1(key.encode('utf-8')).hexdigest()
+    return os.path.join(folder, SHARDS, f'{name}.json')
+
+
+def load(data: dict) -> dict:
+    '''Fill in an entry's data from its shard, if it has not been read'''
+    if isinstance(data, dict) and SHARD in data:
+        children = data.pop('children', None)
+        data.update(data.pop(SHARD).load())
+        if children is not None:
+            data['children'] = children
+    return data
+
+
+def is_sharded(source: str) -> bool:
+    return fs.isfolder(source)
+
+
+def load_source(folder: str) -> dict:
+    index = fs.load_json(os.path.join(folder, INDEX))
+    return {'directory': index.get('directory', []),
+            'entries': _entries(folder, index.get('entries', {}))}
+
+
+def _entries(folder, index, key=''):
+    entries = {SHARD: Shard(folder, key)} if index.get(SHARD) else {}
+    if 'children' in index:
+        entries['children'] = {
+            name: _entries(folder, child, f'{key}/{name}')
+            for name, child in index['children'].items()}
+    return entries
+
+
+def save_source(site_data: dict, folder: str, sync: bool = False):
+    '''
+    Write the index, and the shards of every entry that has been read.
+    If sync, every file is on disk before this returns.
+    '''
+    keys = set()
+    index = _index(folder, site_data.get('entries', {}), keys, sync)
+    fs.save_json({'directory': site_data.get('directory', []),
+                  'entries': index}, os.path.join(folder, INDEX), sync=sync)
+    for shard in fs.find_by_type(os.path.join(folder, SHARDS), '.json'):
+        if os.path.basename(shard) not in keys:
+            fs.delete_file(shard)
+    if sync:
+        fs.fsync_folder(os.path.join(folder, SHARDS))
+        fs.fsync_folder(folder)
+
+
+def _index(folder, entries, keys, sync, key=''):
+    index = {}
+    with_shard = _save_shard(folder, entries, key, sync)
+    if with_shard:
+        index[SHARD] = True
+        keys.add(os.path.basename(filename(folder, key)))
+    children = (entries or {}).get('children')
+    if children is not None:
+        index['children'] = {
+            name: _index(folder, child, keys, sync, f'{key}/{name}')
+            for name, child in children.items()}
+    return index
+
+
+def _save_shard(folder, entries, key, sync):
+    if not isinstance(entries, dict):
+        return False
+    if SHARD in entries:
+        return True
+    payload = {k: v for k, v in entries.items() if k != 'children'}
+    if payload:
+        fs.save_string(json.dumps(payload, ensure_ascii=False, default=str),
+                       filename(folder, key), sync)
+    return bool(payload)
+
+
+def split_source(source: str, folder: str):
+    '''Convert a single-file .src source into a sharded folder'''
+    save_source(fs.load_yaml(source), folder)
+
+
+def join_source(folder: str, source: str):
+    '''Convert a sharded folder back into a single-file .src source'''
+    site_data = load_source(folder)
+    _load_all(site_data['entries'])
+    fs.save_yaml(site_data, source)
+
+
+def _load_all(entries):
+    if not isinstance(entries, dict):
+        return
+    load(entries)
+    for child in (entries.get('children') or {}).values():
+        _load_all(child)
@@ -1,4 +1,7 @@
-from smeagol.site.page.page import Page
+from smeagol.conversion.text_tree import tree_cache
+from smeagol.site.page.page import Page, find_terms, make_url
+from smeagol.site.page.registry import Registry
+from smeagol.site.tag_index import TagIndex, locate
 from smeagol.utilities import utils
 
 
@@ -6,7 +9,8 @@ class Site(Page):
     def __init__(self, *args, **kwargs):
         self.serialisation_format = kwargs.pop('serialisation_format', {})
         self.serialiser = self._serialiser(self.serialisation_format)
-        super().__init__(*args, **kwargs)
+        registry = Registry(kwargs.pop('page_cache', 1000))
+        super().__init__(*args, registry=registry, **kwargs)
         self.current = self.root
         self._analysis.update({
             'urls': [],
@@ -14,6 +18,8 @@ class Site(Page):
         })
         self._wordlist = []
         self._serial = {'t': '', 'l': '', 'p': '', 'd': '', 'n': ''}
+        self._count = None
+        self.tag_index = TagIndex()
 
     def __getattr__(self, attr):
         match attr:
@@ -27,7 +33,34 @@ class Site(Page):
                 f"'{name}' object has no attribute '{attr}'") from e
 
     def __len__(self):
-        return sum(1 for page in self)
+        if self._count is None:
+            self._count = sum(1 for _ in self.iteritems())
+        return self._count
+
+    def iternames(self):
+        for names, _data in self.iteritems():
+            yield names
+
+    def iterdata(self):
+        for _names, data in self.iteritems():
+            yield data
+
+    def iteritems(self):
+        return self.entries.items()
+
+    def find_tags(self, *tags: str):
+        '''(names, node) for each occurrence of tags, in site order'''
+        for names, _path, node in self._find_tags(*tags):
+            yield list(names), node
+
+    def _find_tags(self, *tags: str):
+        self.tag_index.refresh(self.iteritems())
+        current = tree = None
+        for names, path in self.tag_index.find(*tags):
+            if names != current:
+                current = names
+                tree = tree_cache.parse(self.tag_index.texts[names] or [])
+            yield names, path, locate(tree, path)
 
     @property
     def hierarchy(self):
@@ -35,20 +68,31 @@ class Site(Page):
             yield self.new(names)
 
     def add_entry(self, page: Page):
-        self.entries.add(page.names)
+        added = self.entries.add(page.names)
+        if self._count is not None:
+            self._count += added
         with utils.ignored(IndexError):
             self.directory.add(page.names)
+            self.navigation.add(page.names)
 
     def remove_entry(self, page: Page):
         self.entries.remove(page.names.copy())
+        if self._count is not None:
+            self._count -= 1
         with utils.ignored(IndexError):
+            navigation = self.navigation  # indexed before the directory changes
             self.directory.remove(page.names.copy())
+            navigation.remove(page.names)
+            self.registry.clear()  # locations of later siblings have moved
 
     def new(self, values: list[str] | list[int] = None) -> Page:
         values = values or [self.entries.name]
         with utils.ignored(TypeError):
             values = self.directory[values].names
-        return Page(self.directory, self.entries, values[:])
+        return self.registry.get(values, self._new)
+
+    def _new(self, names: list[str]) -> Page:
+        return Page(self.directory, self.entries, names[:], self.registry)
 
     @property
     def root(self):
@@ -59,17 +103,18 @@ class Site(Page):
         for obj in self._analysis.values():
             obj.clear()
         self.lines.clear()
-        for entry_number, entry in enumerate(self):
+        for entry_number, (names, data) in enumerate(self.iteritems()):
+            data = data or {}
             base = len(self.lines)
-            analysis = entry.analysis()
-            self.urls.append(entry.url)
-            self.pages.append(entry.name)
-            self.lines.extend(entry.lines)
-            self._add_terms(analysis, base, entry_number)
+            lines = tree_cache.parse(data.get('text', [])).stringify().splitlines()
+            self.urls.append(make_url(names, not data.get('children')))
+            self.pages.append(names[-1])
+            self.lines.extend(lines)
+            self._add_terms(find_terms(lines), base, entry_number)
         return self._analysis
 
-    def _add_terms(self, analysis, base, entry_number):
-        for term, line_numbers in analysis['terms'].items():
+    def _add_terms(self, terms, base, entry_number):
+        for term, line_numbers in terms.items():
             line_numbers = utils.increment(line_numbers, by=base)
             locations = {str(entry_number): sorted(line_numbers)}
             self.terms.setdefault(term, {}).update(locations)
@@ -79,15 +124,16 @@ class Site(Page):
         if not self.serialisation_format:
             return []
         self._wordlist.clear()
-        for entry in self:
-            self._serial['t'] = utils.buy_caps(entry.name)
-            self._serialise(entry.text)
+        current = handled = None  # the last node serialised, and its entry
+        for names, path, node in self._find_tags(*self.serialiser):
+            if names == current and path[:len(handled)] == handled:
+                continue  # inside a node already serialised
+            if (serialise := self.serialiser.get(node.name)):
+                current, handled = names, path
+                self._serial['t'] = utils.buy_caps(names[-1])
+                serialise(node)
         return self._wordlist
 
-    def _serialise(self, node):
-        for child in node.nodes():
-            self.serialiser.get(child.name, self._serialise)(child)
-
     def _language(self, node):
         self._serial['l'] = node.stringify()
         self._serial['n'] = ''
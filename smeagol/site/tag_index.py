@@ -0,0 +1,79 @@
+'''
+An inverted index from tag names to where they occur in a site's entries.
+
+Each occurrence is an entry's names and the path of child indices from
+the root of its TextTree to the tagged node. A tag `name@language` is
+indexed under both `name@language` and `name`. An entry is re-indexed
+whenever its `text` is no longer the list it was indexed from, which is
+the case after every Entry.text save or journal replay.
+'''
+
+from smeagol.conversion.text_tree import tree_cache
+from smeagol.utilities import utils
+
+
+class TagIndex:
+    def __init__(self):
+        self.tags = {}
+        self.texts = {}
+        self.order = []
+
+    def refresh(self, items):
+        '''Re-index the entries in items whose text has changed'''
+        order = []
+        for names, data in items:
+            order.append(names)
+            text = data.get('text') if isinstance(data, dict) else None
+            if names not in self.texts or self.texts[names] is not text:
+                self.update(names, text)
+        for names in self.texts.keys() - set(order):
+            self.remove(names)
+        self.order = order
+
+    def update(self, names: tuple, text: list):
+        self.remove(names)
+        self.texts[names] = text
+        for path, node in _walk(tree_cache.parse(text or [])):
+            for tag in _names(node.name):
+                self.tags.setdefault(tag, {}).setdefault(names, []).append(path)
+
+    def remove(self, names: tuple):
+        if self.texts.pop(names, None) is None:
+            return
+        for tag in [tag for tag, entries in self.tags.items()
+                    if entries.pop(names, None) and not entries]:
+            del self.tags[tag]
+
+    def find(self, *tags: str):
+        '''(names, path) of each occurrence of tags, in site order'''
+        found = [self.tags.get(tag, {}) for tag in tags]
+        for names in self.order:
+            paths = sorted({path for entries in found
+                            for path in entries.get(names, [])})
+            for path in paths:
+                yield names, path
+
+
+def _names(name):
+    base, _language = utils.try_split(name, '@')
+    return {name, base}
+
+
+def _walk(tree):
+    for i, child in enumerate(tree.root.children):
+        yield from _walk_node(child, (i,))
+
+
+def _walk_node(node, path):
+    if isinstance(node, str):
+        return
+    yield path, node
+    for i, child in enumerate(node.children):
+        yield from _walk_node(child, (*path, i))
+
+
+def locate(tree, path):
+    node = tree.root
+    for i in path:
+        node = node.children[i]
+    return node
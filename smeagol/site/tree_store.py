@@ -0,0 +1,222 @@
+'''
+An array-backed alternative to the nested directory lists.
+
+Every node is a row: its name lives in a single string table, and its
+parent, first child, next sibling and depth in parallel integer
+columns. Branch presents a row as if it were the nested list
+`[name, child, child, ...]`, so Directory and family run on top of a
+TreeStore unchanged.
+
+Names are joined onto the table only when one not yet joined is read,
+so adding a run of rows copies the table once, not once a row.
+
+Rows are numbered in preorder when loaded, so until the tree is next
+changed a full walk is a straight pass down the depth column.
+'''
+
+from array import array
+
+NONE = -1
+
+
+class TreeStore:
+    def __init__(self, directory: list = None):
+        self._text = ''
+        self._added = []  # names added since text was last joined
+        self.offsets = array('i', [0])
+        self.parent = array('i')
+        self.first_child = array('i')
+        self.next_sibling = array('i')
+        self.depth = array('i')
+        self.last_child = array('i')
+        self.size = array('i')
+        self._children = {}
+        self.preorder = True
+        self._load(directory or [''])
+
+    def _load(self, directory: list):
+        stack = [(directory, NONE)]
+        while stack:
+            obj, parent = stack.pop()
+            row = self._add(obj[0], parent)
+            stack.extend((elt, row) for elt in reversed(obj[1:]))
+
+    @property
+    def text(self) -> str:
+        if self._added:
+            self._text = ''.join([self._text, *self._added])
+            self._added.clear()
+        return self._text
+
+    @property
+    def root(self):
+        return Branch(self, 0)
+
+    def __len__(self):
+        return len(self.parent)
+
+    def name(self, row: int) -> str:
+        end = self.offsets[row + 1]
+        text = self._text if end <= len(self._text) else self.text
+        return text[self.offsets[row]:end]
+
+    def add(self, name: str, parent: int = NONE) -> int:
+        self.preorder = False
+        return self._add(name, parent)
+
+    def _add(self, name, parent):
+        row = len(self)
+        self._added.append(name)
+        self.offsets.append(self.offsets[-1] + len(name))
+        self.parent.append(parent)
+        self.depth.append(self.depth[parent] + 1 if parent != NONE else 0)
+        for column in (self.first_child, self.next_sibling, self.last_child):
+            column.append(NONE)
+        self.size.append(0)
+        if parent != NONE:
+            self._link(row, parent, name)
+        return row
+
+    def _link(self, row, parent, name):
+        if (last := self.last_child[parent]) == NONE:
+            self.first_child[parent] = row
+        else:
+            self.next_sibling[last] = row
+        self.last_child[parent] = row
+        self.size[parent] += 1
+        if (cached := self._children.get(parent)):
+            children, indices = cached
+            children.append(row)
+            indices.setdefault(name, len(children))
+
+    def remove(self, row: int):
+        parent = self.parent[row]
+        children = self.children(parent)
+        index = children.index(row)
+        previous = children[index - 1] if index else NONE
+        following = self.next_sibling[row]
+        if previous == NONE:
+            self.first_child[parent] = following
+        else:
+            self.next_sibling[previous] = following
+        if self.last_child[parent] == row:
+            self.last_child[parent] = previous
+        self.size[parent] -= 1
+        self.preorder = False
+        self.parent[row] = self.next_sibling[row] = NONE
+        self._children.pop(parent, None)
+
+    def children(self, row: int) -> array:
+        return self._cached(row)[0]
+
+    def indices(self, row: int) -> dict[str, int]:
+        return self._cached(row)[1]
+
+    def _cached(self, row):
+        try:
+            return self._children[row]
+        except KeyError:
+            children = array('i')
+            indices = {}
+            child = self.first_child[row]
+            while child != NONE:
+                children.append(child)
+                indices.setdefault(self.name(child), len(children))
+                child = self.next_sibling[child]
+            return self._children.setdefault(row, (children, indices))
+
+    def paths(self, row: int = 0):
+        if self.preorder and not row:
+            return self._preorder_paths()
+        return self._linked_paths(row)
+
+    def _preorder_paths(self):
+        text = self.text
+        names = []
+        start = 0
+        for depth, end in zip(self.depth, self.offsets[1:]):
+            del names[depth:]
+            names.append(text[start:end])
+            start = end
+            yield names[:]
+
+    def _linked_paths(self, row):
+        text, offsets = self.text, self.offsets
+        first, following, parent = (
+            self.first_child, self.next_sibling, self.parent)
+        names = []
+        node = row
+        while True:
+            names.append(text[offsets[node]:offsets[node + 1]])
+            yield names[:]
+            if (child := first[node]) != NONE:
+                node = child
+                continue
+            while node != row and following[node] == NONE:
+                node = parent[node]
+                names.pop()
+            if node == row:
+                return
+            names.pop()
+            node = following[node]
+
+    def tolist(self, row: int = 0) -> list:
+        return [self.name(row),
+                *(self.tolist(child) for child in self.children(row))]
+
+
+class Branch:
+    __slots__ = ('store', 'row')
+
+    def __init__(self, store: TreeStore, row: int):
+        self.store = store
+        self.row = row
+
+    def __len__(self):
+        return self.store.size[self.row] + 1
+
+    def __getitem__(self, index: int | slice):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if index == 0:
+            return self.store.name(self.row)
+        try:
+            return Branch(self.store, self.store.children(self.row)[index - 1])
+        except IndexError as e:
+            raise IndexError(f'{self[0]} has no child {index}') from e
+
+    def __iter__(self):
+        yield self[0]
+        for row in self.store.children(self.row):
+            yield Branch(self.store, row)
+
+    def __eq__(self, other):
+        try:
+            return (self.store, self.row) == (other.store, other.row)
+        except AttributeError:
+            return self.tolist() == other
+
+    def __hash__(self):
+        return hash((id(self.store), self.row))
+
+    def __repr__(self):
+        return f'Branch: name = {self[0]}'
+
+    def append(self, obj: list):
+        self.store.add(obj[0], self.row)
+
+    def pop(self, index: int):
+        branch = self[index]
+        self.store.remove(branch.row)
+        return branch
+
+    def child_indices(self):
+        return self.store.indices(self.row)
+
+    def paths(self):
+        return self.store.paths(self.row)
+
+    def tolist(self):
+        return self.store.tolist(self.row)
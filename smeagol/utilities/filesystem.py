@@ -1,6 +1,8 @@
+import hashlib
 import json
 import os
 import pathlib
+import pickle
 import random
 import shutil
 import socket
@@ -23,18 +25,20 @@ def makedirs(filename):
         os.makedirs(os.path.dirname(filename))
 
 
-def save_json(obj, filename, indent=None):
+def save_json(obj, filename, indent=None, sync=False):
     makedirs(filename)
     try:
-        _save_json(obj, filename, indent)
+        _save_json(obj, filename, indent, sync)
     except TypeError as e:
         save_string(str(obj), f := f'{filename}!error.txt')
         raise TypeError(str(e), f) from e
 
 
-def _save_json(obj, filename, indent=None):
+def _save_json(obj, filename, indent=None, sync=False):
     with open(filename, 'w', encoding='utf-8') as f:
         json.dump(obj, f, ensure_ascii=False, indent=indent)
+        if sync:
+            fsync(f)
 
 
 def copy_all(files: dict):
@@ -46,18 +50,44 @@ def copy_all(files: dict):
                 print('Warning! Unable to save ' + src)
 
 
-def save_string(string, filename):
+def save_string(string, filename, sync=False):
     makedirs(filename)
     with open(filename, 'w', encoding='utf-8') as f:
         f.write(string)
+        if sync:
+            fsync(f)
 
 
-def save_yaml(obj, filename):
+def save_yaml(obj, filename, sync=False):
     if not obj or not filename:
         return
     makedirs(filename)
     with open(filename, 'w', encoding='utf-8') as f:
         yaml.dump(obj, f, allow_unicode=True, width=5000, sort_keys=False)
+        if sync:
+            fsync(f)
+
+
+def fsync(file):
+    '''Push what has been written to file through to the disk'''
+    file.flush()
+    os.fsync(file.fileno())
+
+
+def fsync_folder(folder):
+    '''Push folder's list of names, with any renames, through to the disk'''
+    with ignored(OSError):  # folders cannot be opened on Windows
+        descriptor = os.open(folder or '.', os.O_RDONLY)
+        try:
+            os.fsync(descriptor)
+        finally:
+            os.close(descriptor)
+
+
+def replace(source, destination):
+    '''Rename source over destination, and push the rename to the disk'''
+    os.replace(source, destination)
+    fsync_folder(os.path.dirname(destination))
 
 
 def jsonify(obj):
@@ -97,10 +127,12 @@ def readlines(filename):
         yield line
 
 
-def load_yaml(filename, default_obj=None):
+def load_yaml(filename, default_obj=None, snapshot=False):
     if not filename:
         return default_obj or {}
     try:
+        if snapshot:
+            return snapshots.load(filename, _load_yaml)
         return _load_yaml(filename)
     except FileNotFoundError:
         save_yaml(default_obj, filename)
@@ -120,6 +152,75 @@ def _safe_load_yaml(file, filename):
             f'{filename} is not a yml file, or is malformed') from e
 
 
+class Snapshots:
+    '''
+    Pickled images of parsed files, kept until the file changes.
+
+    A snapshot is used outright if the file's mtime and size are as they
+    were, and otherwise only if the file's contents still hash the same.
+    '''
+
+    def __init__(self, folder=None):
+        self.folder = folder or os.path.join(
+            os.path.expanduser('~'), '.smeagol', 'snapshots')
+        self.hits = self.misses = 0
+
+    def __str__(self):
+        return f'Snapshots: {self.hits} hits, {self.misses} misses'
+
+    def snapshot(self, filename):
+        key = os.path.abspath(filename).encode('utf-8')
+        name = hashlib.sha1(key).hexdigest()
+        return os.path.join(self.folder, f'{name}.pickle')
+
+    def load(self, filename, loader: callable):
+        stat = os.stat(filename)
+        stamp = (os.path.abspath(filename), stat.st_mtime_ns, stat.st_size)
+        snapshot = self.snapshot(filename)
+        cached = self._read(snapshot)
+        if cached and cached['stamp'] == stamp:
+            self.hits += 1
+            return pickle.loads(cached['data'])
+        digest = _digest(filename)
+        if cached and cached['digest'] == digest:
+            self.hits += 1
+            self._write(snapshot, stamp, digest, cached['data'])
+            return pickle.loads(cached['data'])
+        self.misses += 1
+        obj = loader(filename)
+        self._write(snapshot, stamp, digest, pickle.dumps(obj, protocol=-1))
+        return obj
+
+    @staticmethod
+    def _read(snapshot):
+        with ignored(OSError, pickle.UnpicklingError, EOFError,
+                     AttributeError, ValueError):
+            with open(snapshot, 'rb') as f:
+                return pickle.load(f)
+
+    @staticmethod
+    def _write(snapshot, stamp, digest, data):
+        makedirs(snapshot)
+        with ignored(OSError):
+            with open(temp := f'{snapshot}.tmp', 'wb') as f:
+                pickle.dump({'stamp': stamp, 'digest': digest, 'data': data},
+                            f, protocol=-1)
+            os.replace(temp, snapshot)
+
+    def clear(self):
+        for snapshot in find_by_type(self.folder, '.pickle'):
+            delete_file(snapshot)
+        self.hits = self.misses = 0
+
+
+def _digest(filename):
+    with open(filename, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+snapshots = Snapshots()
+
+
 def change(filename, fn, newfilename=None):
     '''Run function `fn` on entire object in filename'''
     newfilename = newfilename or filename
@@ -36,14 +36,22 @@ class Styles:
         return iter(sorted(self.styles.values(), key=lambda s: s.name))
 
     def __getitem__(self, name):
+        style, language = self._find(name)
+        style.language_code = language
+        return style
+
+    def select(self, name):
+        '''A copy of the style for name, in a language of its own'''
+        style, language = self._find(name)
+        return style.in_language(language)
+
+    def _find(self, name):
         name, language = utils.try_split(name, '@')
         name = name.strip('*†')
         try:
-            style = self.styles[name]
+            return self.styles[name], language
         except KeyError as e:
             raise KeyError(f'Style {name} is not defined.') from e
-        style.language_code = language
-        return style
 
     def __setitem__(self, name, value):
         self.styles[name] = value
@@ -192,6 +192,12 @@ class Tag:
                         f"'{type(self).__name__}' object has no attribute '{attr}'") from e
         return value
 
+    def in_language(self, code):
+        '''A shallow copy whose language code is its own'''
+        tag = object.__new__(type(self))
+        vars(tag).update(vars(self), language_code=code)
+        return tag
+
     def incremented_copy(self, level):
         if level > 1:
             level -= 1
@@ -313,8 +319,9 @@ class Tag:
             'pipe', 'repeat', 'template', 'keep_tags'
         }
 
-    def decode_param(self, options):
-        return ''.join(utils.alternate_yield([_text, self._decode], self.param.split('$'), *options))
+    def decode_param(self, options, params=None):
+        params = self.param.split('$') if params is None else params
+        return ''.join(utils.alternate_yield([_text, self._decode], params, *options))
 
     def decode_link(self, text, middle_mouse=False):
         return ''.join(utils.alternate_yield([_text, self._decode], self.link.split('$'), text, middle_mouse=middle_mouse))
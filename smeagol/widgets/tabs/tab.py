@@ -7,6 +7,8 @@ from smeagol.widgets.textbox.textbox import Textbox
 
 # pylint: disable=R0902
 
+IDLE = 60000  # ms without a save before journalled edits are compacted
+
 
 class Tab(tk.Frame):
     def __init__(self, parent, commands: list[tuple], clipboard):
@@ -18,6 +20,7 @@ class Tab(tk.Frame):
         self.commands = self._commands + commands
         self.textbox = self._textbox()
         self.is_open = True
+        self._compaction = None
 
     def _textbox(self):
         textbox = Textbox(self.clipboard, self)
@@ -42,14 +45,20 @@ class Tab(tk.Frame):
         self.entry.title = self.textbox.title
         self.entry.update_date()
         self.entry.position = self.textbox.index('insert')
-        self.interface.save_site()
+        self.interface.save_site_entry(self.entry)
         filename, saved = self.interface.save_entry(self.entry, True)
         # saved? = file saved rather than deleted
         message = 'Saving' if saved else 'Deleting'
         self.unshow_edited()
+        self.compact_when_idle()
         print(f'{message} {filename}')
         return 'break'
 
+    def compact_when_idle(self):
+        if self._compaction:
+            self.after_cancel(self._compaction)
+        self._compaction = self.after(IDLE, self.interface.compact)
+
     def save_entries(self, _event=None):
         for percentage in self.interface.save_entries():
             print(f'{percentage}% complete')
@@ -36,5 +36,12 @@ class BaseTextbox(Text):
         return super().get(position)
 
     def formatted_get(self, start=START, end=END):
-        return [t for t in super().dump(start, end)
-                if t[1] != 'sel' and t[0] != 'mark']
+        '''
+        (key, value, index) for each tag and run of text but the selection.
+        Text.dump would call back into Python once per item, so ask Tcl for
+        the whole list instead.
+        '''
+        items = iter(self.tk.splitlist(
+            self.tk.call(self._w, 'dump', '-text', '-tag', start, end)))
+        return [item for item in zip(items, items, items)
+                if item[1] != 'sel' or item[0] == 'text']
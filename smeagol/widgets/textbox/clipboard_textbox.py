@@ -1,6 +1,7 @@
 from typing import Optional
 import tkinter as tk
 import json
+from smeagol.conversion.text_tree.tokenizer import dump_events
 from smeagol.utilities.types import TextTree, Node
 from smeagol.utilities import utils
 from smeagol.widgets.textbox.styled_textbox import StyledTextbox
@@ -61,9 +62,8 @@ class ClipboardTextbox(StyledTextbox):
 
     def _copy(self, borders=SELECTION, clip=True):
         """@error: raise TclError if no text is selected"""
-        formatted_text = "\x08" + json.dumps(
-            self.formatted_get(*borders), ensure_ascii=False
-        ).replace("],", "],\n")
+        events = list(dump_events(self.formatted_get(*borders)))
+        formatted_text = "\x08" + json.dumps(events, ensure_ascii=False)
         text = self.get(*borders)
         if clip:
             self.clipboard_clear()
@@ -3,7 +3,8 @@ from smeagol.utilities import utils
 from smeagol.widgets.textbox.base_textbox import BaseTextbox
 from smeagol.utilities.types import Styles, Style
 
-from smeagol.conversion.text_tree.text_tree import TextTree
+from smeagol.conversion.text_tree.incremental import (IncrementalTree,
+                                                      tagged_lines)
 
 
 SELECTION = "sel.first", "sel.last"
@@ -24,6 +25,7 @@ class StyledTextbox(BaseTextbox):
         self.default_ime = {}
         self.ime = {}
         self.off_keys = {}
+        self._parser = None
         super().__init__(parent, height=1, width=1, wrap=tk.WORD, undo=True)
         self._styles = None
         self.styles_menu: dict[str, tk.IntVar] = {}
@@ -43,7 +45,10 @@ class StyledTextbox(BaseTextbox):
 
     @property
     def text(self):
-        return TextTree(self.formatted_text, self.styles.ranks)
+        ranks = self.styles.ranks
+        if self._parser is None or self._parser.ranks != ranks:
+            self._parser = IncrementalTree(dict(ranks))
+        return self._parser.update(tagged_lines(self.formatted_text))
 
     @property
     def styles(self):
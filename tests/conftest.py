@@ -0,0 +1,18 @@
+import pytest
+import yaml
+
+from smeagol.editor.interface import assets
+
+
+@pytest.fixture(name='write_templates')
+def fixture_write_templates(tmp_path):
+    '''Write each of texts as a template file, and return them as Templates'''
+    def write(texts: dict, styles: dict, sections=()):
+        filenames = {}
+        for name, text in texts.items():
+            filenames[name] = str(tmp_path / f'{name}.tpl')
+            with open(filenames[name], 'w', encoding='utf-8') as f:
+                yaml.dump({'text': text, 'styles': styles}, f)
+        sections = {name: filenames.pop(name) for name in sections}
+        return assets.Templates({**filenames, 'sections': sections})
+    return write
@@ -0,0 +1,80 @@
+'''
+Implementations that have since been replaced, kept for the tests that
+check their replacements against them, and for the benchmarks that time
+one against the other.
+'''
+
+import re
+
+from smeagol.conversion.text_tree.tags import Tags
+from smeagol.conversion.text_tree.text_tree import TextTree
+from smeagol.editor.interface.templates.template import Template
+
+
+class LegacyTree(TextTree):
+    '''TextTree with the list-based Tags.rationalise'''
+
+    def __init__(self, text, ranks=None):
+        Tags.__init__(self, ranks)
+        self.closing_tags = []
+        self.process_strings(text)
+        if self.state == 'tagoff':
+            self.rationalise()
+
+    def open(self):
+        tags = []
+        self.open_tags.append(tags)
+        return tags
+
+    def _rationalise(self):
+        if len(self.opening_tags) >= len(self.closing_tags):
+            self.closing_tags.sort(key=self._rank)
+        tag = self._rational_tag
+        self.rename_opener(tag)
+        self.closing_tags.remove(tag)
+        self.remove_opener()
+
+    @property
+    def _rational_tag(self):
+        if len(self.opening_tags) >= len(self.closing_tags):
+            return self.closing_tags[0]
+        return self.opening_tags[-1].name
+
+    def rename_opener(self, name):
+        opener = self.opening_tags[-1]
+        for tag in self.opening_tags:
+            if tag is opener:
+                return
+            if tag.name == name:
+                tag.name, opener.name = opener.name, name
+                return
+
+
+def flatten(node):
+    '''Names and strings in document order, with depths, without recursion'''
+    stack, output = [(node, 0)], []
+    while stack:
+        node, depth = stack.pop()
+        if isinstance(node, str):
+            output.append((depth, node))
+            continue
+        output.append((depth, node.name))
+        stack.extend((child, depth + 1) for child in reversed(node.children))
+    return output
+
+
+class LegacyTemplate(Template):
+    '''Template with self-links found by a regex over the finished page'''
+
+    def html(self, context, components=None):
+        html = super().html(context, components)
+        return re.sub(fr'<a href="{context.page.name}\.html.*?">(.*?)</a>',
+                      r'<span class="self-link">\1</span>', html)
+
+    def span(self, obj, components, tag, context):
+        start = ''
+        if not context.started:
+            start = components.start or ''
+            context.started.update(components.end or '')
+        text = ''.join([self._html(elt, components, context) for elt in obj])
+        return f'{start}{tag.open}{text}{tag.close}'
@@ -0,0 +1,72 @@
+'''
+Pages rendered from many threads through one shared TemplateStore,
+switching threads as often as Python allows, against each page
+rendered alone.
+'''
+
+import random
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from smeagol.editor.interface.templates.template_store import TemplateStore
+from smeagol.site.site import Site
+from smeagol.widgets.styles.styles import Styles
+
+STYLES = {
+    'data': {'type': 'data'}, 'template': {'type': 'template'},
+    'toc': {'type': 'toc', 'param': '<a href="$link$">$name$</a>',
+            'open': '<ul>', 'close': '</ul>',
+            'start': '<li>', 'end': '</li>'},
+    'p': {'type': 'block', 'start': '<p>', 'end': '</p>'},
+    'a': {'type': 'anchor'}, 'b': {}}
+TEMPLATES = {
+    'main': ['<template>header</template>', '<p><data>name</data></p>',
+             '<toc>lineage-siblings-children</toc>',
+             '<template>main</template>', '<p><data>year</data></p>'],
+    'entry': ['<data>contents</data>'],
+    'header': ['<p><data>root</data> <b>header</b></p>']}
+
+
+@pytest.fixture(name='templates')
+def fixture_templates(write_templates):
+    return write_templates(TEMPLATES, STYLES, ['header'])
+
+
+@pytest.fixture(name='site')
+def fixture_site():
+    rng = random.Random(0)
+    names = [f'e{n}' for n in range(10)]
+    directory, entries = ['Site'], {}
+    for name in names:
+        leaves = [f'{name}.{n}' for n in range(5)]
+        directory.append([name, *([leaf] for leaf in leaves)])
+        entries[name] = {'text': text(name, names, rng), 'children': {
+            leaf: {'text': text(leaf, names, rng)} for leaf in leaves}}
+    return Site(directory=directory,
+                entries={'children': {'Site': {'children': entries}}})
+
+
+def text(name, names, rng):
+    return [f'<p>{name} links to <a>{rng.choice(names)}.html|'
+            f'<b>{rng.choice(names)}</b></a></p>' for _ in range(5)]
+
+
+def store(templates, compiled=True):
+    return TemplateStore(templates, Styles(dict(STYLES)), compiled=compiled)
+
+
+@pytest.mark.parametrize('compiled', [True, False])
+def test_shared_store_renders_as_each_alone(site, templates, compiled):
+    pages = [site.new(list(names)) for names in site.iternames()]
+    alone = [store(templates, compiled).html(page) for page in pages]
+    shared = store(templates, compiled)
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(8) as pool:
+            together = list(pool.map(shared.html, pages * 5))
+    finally:
+        sys.setswitchinterval(interval)
+    assert together == alone * 5
@@ -0,0 +1,52 @@
+'''
+Family lookups through a Directory's child-index maps, against the
+same lookups with no maps kept.
+'''
+
+import random
+
+from smeagol.site import family
+from smeagol.site.directory import Directory
+
+
+def tree(rng, size):
+    root = ['root']
+    nodes = [(root, 0)]
+    for n in range(size):
+        node, depth = rng.choice([(node, depth) for node, depth in nodes
+                                  if depth < 4])
+        node.append(child := [f'n{n}'])
+        nodes.append((child, depth + 1))
+    return root
+
+
+def test_kept_maps_answer_as_fresh_ones():
+    rng = random.Random(0)
+    directory = Directory(tree(rng, 300))
+    indices = directory.indices.children
+    everyone = list(directory)
+    for names in everyone:
+        for function in (family.children, family.siblings, family.aunts,
+                         family.descendants):
+            assert (list(function(directory.directory, names, indices))
+                    == list(function(directory.directory, names)))
+        if names != everyone[-1]:
+            assert (family.next_entry(directory.directory, names.copy(),
+                                      indices=indices)
+                    == family.next_entry(directory.directory, names.copy()))
+        if len(names) > 1:
+            assert (family.previous_entry(directory.directory, names.copy(),
+                                          indices)
+                    == family.previous_entry(directory.directory,
+                                             names.copy()))
+
+
+def test_reordered_in_place():
+    directory = Directory(['root', ['a'], ['b'], ['c']])
+    indices = directory.indices.children
+    assert family.get_index(directory.directory, 'a', indices) == 1
+    obj = directory.directory
+    obj[1], obj[3] = obj[3], obj[1]  # same length, so the map looks current
+    assert family.get_index(obj, 'a', indices) == 3
+    assert family.get_index(obj, 'c', indices) == 1
+    assert family.get_index(obj, 'a') == 3
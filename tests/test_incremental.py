@@ -0,0 +1,70 @@
+'''
+Trees from IncrementalTree.update, edit after edit, against a TextTree
+parsed afresh from the same lines, blank lines among them.
+'''
+
+import random
+
+from smeagol.conversion.text_tree.incremental import (IncrementalTree,
+                                                      tagged_lines)
+from smeagol.conversion.text_tree.text_tree import TextTree
+from smeagol.conversion.text_tree.tree_cache import compact
+
+FRAGMENTS = ['', '', 'plain', '<b>bold</b>', '<i>open', 'close</i>',
+             '<p>para</p>', '<p><b>both</b> ends</p>', 'a &lt; b']
+RANKS = {'p': 1, 'b': 2, 'i': 3}
+
+
+def line(rng):
+    return ' '.join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 3)))
+
+
+def edit(rng, lines):
+    lines = lines.copy()
+    position = rng.randint(0, len(lines))
+    match rng.choice(['insert', 'delete', 'change']):
+        case 'insert':
+            lines[position:position] = [line(rng)
+                                        for _ in range(rng.randint(1, 3))]
+        case 'delete':
+            del lines[position:position + rng.randint(1, 3)]
+        case 'change':
+            lines[position:position + 1] = [line(rng)]
+    return lines
+
+
+def test_updates_match_fresh_parses():
+    rng = random.Random(0)
+    parser = IncrementalTree(RANKS)
+    lines = []
+    for _ in range(500):
+        edited = edit(rng, lines)
+        try:
+            fresh = TextTree(edited, RANKS)
+        except IndexError:  # a closer with nothing open
+            continue
+        lines = edited
+        assert compact(parser.update(lines).root) == compact(fresh.root)
+
+
+def test_earlier_trees_keep_their_nodes():
+    parser = IncrementalTree(RANKS)
+    lines = ['<p>one</p>', '', '<p>two</p>', '<p>three</p>']
+    first = parser.update(lines)
+    before = compact(first.root)
+    second = parser.update(['<p>zero</p>', *lines])
+    assert compact(first.root) == before
+    for tree in (first, second):
+        assert all(child.parent is tree.root for child in tree.root.children
+                   if not isinstance(child, str))
+
+
+def test_blank_lines_kept():
+    dump = [('tagon', 'p', '1.0'), ('text', 'one', '1.0'),
+            ('tagoff', 'p', '1.3'), ('text', '\n', '1.3'),
+            ('text', '\n', '2.0'), ('text', 'two <', '3.0'),
+            ('text', '\n', '3.5')]
+    lines = tagged_lines(dump)
+    assert lines == ['<p>one</p>', '', 'two &lt;']
+    assert (compact(IncrementalTree().update(lines).root)
+            == compact(TextTree(dump).root))
@@ -0,0 +1,60 @@
+'''
+The rank-ordered Tags.rationalise against the list-based one it
+replaced, on randomly generated lines where tags open and close in any
+order, each at any rank. Lines that neither can untangle must fail in
+both alike.
+'''
+
+import random
+
+import pytest
+
+from smeagol.conversion.text_tree.text_tree import TextTree
+from tests.reference import LegacyTree, flatten
+
+NAMES = [f't{n}' for n in range(8)]
+
+
+def line(rng):
+    '''Tags opened and closed in any order, with words between some'''
+    parts, open_tags = [], []
+    for _ in range(rng.randint(1, 30)):
+        if open_tags and rng.random() < 0.5:
+            parts.append(f'</{open_tags.pop(rng.randrange(len(open_tags)))}>')
+        else:
+            open_tags.append(name := rng.choice(NAMES))
+            parts.append(f'<{name}>')
+        if rng.random() < 0.4:
+            parts.append(rng.choice(['word', 'two words', ' ']))
+    rng.shuffle(open_tags)
+    parts.extend(f'</{name}>' for name in open_tags)
+    return ''.join(parts)
+
+
+def ranks(rng):
+    return {name: rng.randint(-3, 3) for name in rng.sample(NAMES, 5)}
+
+
+def outcome(tree, text, tag_ranks):
+    try:
+        return flatten(tree(text, tag_ranks).root)
+    except ValueError:
+        return ValueError
+
+
+@pytest.mark.parametrize('seed', range(300))
+def test_same_outcome_as_list_based(seed):
+    rng = random.Random(seed)
+    text, tag_ranks = [line(rng) for _ in range(rng.randint(1, 4))], ranks(rng)
+    assert (outcome(TextTree, text, tag_ranks)
+            == outcome(LegacyTree, text, tag_ranks))
+
+
+@pytest.mark.parametrize('count', [1, 2, 50, 500])
+def test_same_tree_when_all_close_together(count):
+    names = NAMES * (count // len(NAMES) + 1)
+    text = [''.join(f'<{name}>' for name in names[:count]) + 'word'
+            + ''.join(f'</{name}>' for name in names[:count])]
+    tag_ranks = {name: n % 7 - 3 for n, name in enumerate(NAMES)}
+    assert (flatten(TextTree(text, tag_ranks).root)
+            == flatten(LegacyTree(text, tag_ranks).root))
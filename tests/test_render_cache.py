@@ -0,0 +1,78 @@
+'''
+Pages written through the render cache against pages rendered afresh,
+for templates that show things a page does not read from the site.
+'''
+
+from datetime import datetime
+
+import pytest
+
+from smeagol.editor.interface import build_graph
+from smeagol.editor.interface.render_cache import RenderCache
+from smeagol.editor.interface.templates.template_store import TemplateStore
+from smeagol.site.site import Site
+from smeagol.widgets.styles.styles import Styles
+
+STYLES = {'data': {'type': 'data'}, 'template': {'type': 'template'},
+          'p': {'type': 'block', 'start': '<p>', 'end': '</p>'}}
+TEMPLATES = {
+    'main': ['<p><data>name</data> of <data>root</data></p>',
+             '<template>footer</template>'],
+    'entry': [],
+    'footer': ['<p>&copy; <data>year</data></p>']}
+
+
+@pytest.fixture(name='store')
+def fixture_store(write_templates):
+    templates = write_templates(TEMPLATES, STYLES, ['footer'])
+    return TemplateStore(templates, Styles(dict(STYLES)))
+
+
+@pytest.fixture(name='site')
+def fixture_site():
+    names = [f'e{n}' for n in range(5)]
+    return Site(directory=['Site', *([name] for name in names)],
+                entries={'children': {'Site': {'children': {
+                    name: {} for name in names}}}})
+
+
+def session(store, site, graph, folder):
+    '''Every page through a fresh cache, as one build would write them'''
+    cache = RenderCache(str(folder)).start(site, graph, 'assets')
+    reads, pages = {}, []
+    for names in site.iternames():
+        page_reads = reads.setdefault(names, set())
+        pages.append(cache.html(store, site.new(list(names)), page_reads))
+    graph.record(site, reads, cache.digests)
+    return pages, reads, cache
+
+
+def test_kept_pages_are_as_rendered_afresh(store, site, tmp_path):
+    graph = build_graph.BuildGraph('')
+    fresh = [store.html(site.new(list(names))) for names in site.iternames()]
+    first, _reads, cache = session(store, site, graph, tmp_path)
+    assert (cache.hits, cache.misses) == (0, len(fresh))
+    second, _reads, cache = session(store, site, graph, tmp_path)
+    assert (cache.hits, cache.misses) == (len(fresh), 0)
+    assert first == second == fresh
+    assert len(set(fresh)) == len(fresh)
+
+
+def test_year_is_read_through_kept_sections(store, site, tmp_path):
+    _pages, reads, _cache = session(store, site, build_graph.BuildGraph(''),
+                                    tmp_path)
+    assert all(('year',) in page_reads for page_reads in reads.values())
+
+
+def test_new_year_misses(store, site, tmp_path, monkeypatch):
+    graph = build_graph.BuildGraph('')
+    session(store, site, graph, tmp_path)
+
+    class NextYear(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime(datetime.now().year + 1, 1, 1)
+
+    monkeypatch.setattr(build_graph, 'dt', NextYear)
+    _pages, _reads, cache = session(store, site, graph, tmp_path)
+    assert cache.hits == 0
@@ -0,0 +1,67 @@
+'''
+Self-links spotted as each anchor is rendered, against the regex that
+used to run over every finished page.
+'''
+
+import random
+
+import pytest
+
+from smeagol.conversion.text_tree import tree_cache
+from smeagol.editor.interface.templates.template import Context, Template
+from smeagol.editor.interface.templates.template_store import TemplateStore
+from smeagol.site.site import Site
+from smeagol.widgets.styles.styles import Styles
+from tests.reference import LegacyTemplate
+
+STYLES = {'a': {'type': 'anchor'}, 'b': {}, 'line': {'type': 'line'},
+          'ref': {'type': 'anchor', 'param': '$text$.html">$node$'}}
+
+
+@pytest.fixture(name='templates')
+def fixture_templates():
+    store = TemplateStore(styles=Styles(dict(STYLES)))
+    return (LegacyTemplate(None, None, None, store),
+            Template(None, None, None, store))
+
+
+def site(names):
+    return Site(directory=['Site', *([name] for name in names)],
+                entries={'children': {'Site': {'children': {
+                    name: {} for name in names}}}})
+
+
+def text(names, count, rng):
+    lines = []
+    for _ in range(count):
+        name = rng.choice(names)
+        lines.append(f'<line>Go to <a>{name}.html#top|<b>{name}</b></a> '
+                     f'or <ref>{name}</ref></line>')
+    return lines
+
+
+def html(template, page, lines):
+    template.text = tree_cache.parse(lines)
+    return template.html(Context(page, written=page))
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_same_html_as_regex(templates, seed):
+    rng = random.Random(seed)
+    names = [f'entry{n}' for n in range(20)]
+    legacy, new = templates
+    for page in list(site(names).hierarchy)[1:]:
+        lines = text(names, 10, rng)
+        assert html(new, page, lines) == html(legacy, page, lines)
+
+
+@pytest.mark.parametrize('name, other, expected', [
+    ('e.g', 'eag', '<line><a href="eag.html">eag</a></line>'),
+    ('c++', 'c++', '<line><span class="self-link">c++</span></line>'),
+    ('a', 'a', '<line><span class="self-link">a</span></line>'),
+    ('a', 'ab', '<line><a href="ab.html">ab</a></line>'),
+])
+def test_names_are_matched_literally(templates, name, other, expected):
+    page = site([name, other]).new(['Site', name])
+    lines = [f'<line><a>{other}.html|{other}</a></line>']
+    assert html(templates[1], page, lines).strip() == expected
@@ -0,0 +1,50 @@
+'''
+The wordlist from the tag index against a walk of every entry that
+serialises each recognised node and goes no further inside it.
+'''
+
+from smeagol.conversion.text_tree.text_tree import TextTree
+from smeagol.site.site import Site
+from smeagol.utilities import utils
+
+FORMAT = {'language': 'lang', 'part of speech': 'pos',
+          'definition': 'def', 'native script': 'ns',
+          'pronunciation': 'ipa'}
+TEXTS = {
+    'alpha': ['<lang>High</lang>', '<pos>noun</pos>',
+              '<def>a <def>nested</def> definition</def>',
+              '<div><def>wrapped <pos>verb</pos></def></div>'],
+    'beta': ['<lang>Low</lang>', '<ns>b</ns>', '<ipa>/b/</ipa>',
+             '<div><div><pos>adj</pos><def>deep</def></div></div>',
+             '<def@en>tagged by language</def@en>'],
+    'gamma': ['<p>nothing here</p>'],
+}
+
+
+def site():
+    return Site(
+        directory=['Site', *([name] for name in TEXTS)],
+        entries={'children': {'Site': {'children': {
+            name: {'text': text} for name, text in TEXTS.items()}}}},
+        serialisation_format=FORMAT)
+
+
+def walked(site):
+    site._wordlist.clear()
+    for names, data in site.iteritems():
+        site._serial['t'] = utils.buy_caps(names[-1])
+        _walk(site, TextTree((data or {}).get('text', [])).root)
+    return list(site._wordlist)
+
+
+def _walk(site, node):
+    for child in node.children:
+        if not isinstance(child, str):
+            site.serialiser.get(child.name, lambda n: _walk(site, n))(child)
+
+
+def test_nested_definitions_once():
+    indexed = site().serialisation()
+    assert indexed == walked(site())
+    assert [row['d'] for row in indexed] == [
+        'a nested definition', 'wrapped verb', 'deep']
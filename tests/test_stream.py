@@ -0,0 +1,69 @@
+'''
+Streamed nodes and events against a TextTree of the same text, for
+markup whose tags span lines or close out of rank order.
+'''
+
+import random
+
+import pytest
+
+from smeagol.conversion.text_tree import stream
+from smeagol.conversion.text_tree.text_tree import TextTree
+from smeagol.conversion.text_tree.tree_cache import compact
+
+RANKS = {'div': 1, 'p': 2, 'b': 3, 'i': 4}
+TEXTS = [
+    [],
+    ['plain', '', 'lines'],
+    ['<p>one <b>bold</b> line</p>', 'between', '<p>another</p>'],
+    ['<div>', '<p>spans</p>', 'three', 'lines</div>', 'after'],
+    ['<p><b>closes</p> out of order</b>', '<i>and <p>again</i></p>'],
+    ['<b><i>both</b></i> nested', '<p>unclosed at the end'],
+    ['<p>a &lt; b</p>', '<unranked>tag</unranked> text'],
+]
+
+
+def fragment(rng):
+    return rng.choice(['text', ' ', '<p>', '</p>', '<b>', '</b>', '<i>',
+                       '</i>', '<div>', '</div>', ''])
+
+
+def fuzzed(count):
+    rng = random.Random(0)
+    texts = []
+    while len(texts) < count:
+        lines = [''.join(fragment(rng) for _ in range(rng.randint(0, 6)))
+                 for _ in range(rng.randint(1, 6))]
+        try:
+            TextTree(lines, RANKS)
+        except (IndexError, ValueError):  # a closer with nothing open
+            continue
+        texts.append(lines)
+    return texts
+
+
+def tree(nodes):
+    return [child if isinstance(child, str) else compact(child)
+            for child in nodes]
+
+
+@pytest.mark.parametrize('lines', TEXTS + fuzzed(300))
+def test_nodes_match_text_tree(lines):
+    expected = tree(TextTree(lines, RANKS).root.children)
+    assert tree(stream.nodes(lines, RANKS)) == expected
+
+
+def walk(node):
+    for child in node.children:
+        if isinstance(child, str):
+            yield 'text', child
+        else:
+            yield 'tagon', child.name
+            yield from walk(child)
+            yield 'tagoff', child.name
+
+
+@pytest.mark.parametrize('lines', TEXTS + fuzzed(300))
+def test_events_walk_text_tree(lines):
+    expected = list(walk(TextTree(lines, RANKS).root))
+    assert list(stream.events(lines, RANKS)) == expected
@@ -0,0 +1,69 @@
+'''
+Trees kept in a file of the caller's choosing, merged between the
+processes that share it, and kept in memory only when there is none.
+'''
+
+from smeagol.conversion.text_tree.text_tree import TextTree
+from smeagol.conversion.text_tree.tree_cache import TreeCache
+
+TEXT = ['<h>Title</h>', '<p>Some <b>bold</b> text</p>']
+
+
+def test_saved_tree_is_rebuilt(tmp_path):
+    filename = str(tmp_path / 'site.trees')
+    first = TreeCache(filename)
+    first.get(TEXT)
+    first.save()
+    second = TreeCache(filename)
+    tree = second.get(TEXT)
+    assert (second.hits, second.misses) == (1, 0)
+    assert tree.stringify() == TextTree(TEXT).stringify()
+
+
+def test_saves_merge(tmp_path):
+    filename = str(tmp_path / 'site.trees')
+    first, second = TreeCache(filename), TreeCache(filename)
+    first.get(['<p>one</p>'])
+    second.get(['<p>two</p>'])
+    first.save()
+    second.save()
+    third = TreeCache(filename)
+    third.get(['<p>one</p>'])
+    third.get(['<p>two</p>'])
+    assert (third.hits, third.misses) == (2, 0)
+
+
+def test_least_recently_used_go_first(tmp_path):
+    filename = str(tmp_path / 'site.trees')
+    old = TreeCache(filename)
+    old.get(['<p>old</p>'])
+    old.save()
+    new = TreeCache(filename, limit=1)
+    new.get(['<p>new</p>'])
+    new.save()
+    cache = TreeCache(filename)
+    cache.get(['<p>new</p>'])
+    cache.get(['<p>old</p>'])
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_absorbed_trees_are_saved(tmp_path):
+    filename = str(tmp_path / 'site.trees')
+    worker, parent = TreeCache(filename), TreeCache(filename)
+    worker.get(TEXT)
+    parent.absorb(*worker.take())
+    parent.save()
+    assert not worker.added
+    cache = TreeCache(filename)
+    cache.get(TEXT)
+    assert (cache.hits, cache.misses) == (1, 0)
+
+
+def test_no_file(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cache = TreeCache()
+    cache.get(TEXT)
+    cache.save()
+    cache.get(TEXT)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert not list(tmp_path.iterdir())